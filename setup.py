@@ -13,12 +13,21 @@ setup(
     py_modules=["actuarial_implementation",
                 "bjork_christensen",
                 "bjork_christensen_augmented",
+                "bootstrap",
+                "calibration",
                 "cubic",
                 "curve",
                 "simulation",
                 "linear",
+                "loadings",
+                "log_discount",
                 "nelson_siegel",
+                "online",
+                "panel",
+                "sensitivity",
+                "store",
                 "svensson_nelson_siegel",
+                "tabulated",
                 "vasicek",
                 "hull_white"],
     package_dir={'': 'src'},
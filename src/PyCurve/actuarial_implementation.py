@@ -1,17 +1,109 @@
+from typing import Any, Optional
+
 import numpy as np
 
+CONVENTIONS = ("simple", "annual", "periodic", "continuous")
+UNITS: dict = {"percent": 100., "decimal": 1.}
+
+
+def check_convention(convention: Any) -> str:
+    if convention in CONVENTIONS:
+        return convention
+    else:
+        raise TypeError("convention must be 'simple', 'annual', 'periodic' or 'continuous'")
+
+
+def check_unit(unit: Any) -> float:
+    if unit in UNITS:
+        return UNITS[unit]
+    else:
+        raise TypeError("unit must be 'percent' or 'decimal'")
+
+
+def _output(x: Any, t: Any, out: Optional[np.ndarray], overwrite: bool) -> np.ndarray:
+    """Buffer receiving the result: out, x itself when it may be overwritten, otherwise a new array"""
+    x, t = np.asarray(x), np.asarray(t)
+    shape = np.broadcast_shapes(x.shape, t.shape)
+    dtype = np.result_type(x.dtype, t.dtype, np.float32)
+    if out is not None:
+        if out.shape != shape or not np.can_cast(dtype, out.dtype, casting="same_kind"):
+            raise ValueError("out must be a float array of shape %s" % (shape,))
+        return out
+    if overwrite and x.shape == shape and x.dtype == dtype and x.flags.writeable:
+        return x
+    return np.empty(shape, dtype=dtype)
+
+
+def _result(result: np.ndarray, out: Optional[np.ndarray]) -> Any:
+    """Plain scalar for scalar inputs, the buffer otherwise"""
+    return result[()] if out is None and result.ndim == 0 else result
+
+
+def rate_to_df(r: Any, t: Any, convention: str = "annual", unit: str = "percent", frequency: int = 1,
+               out: Optional[np.ndarray] = None, overwrite: bool = False) -> Any:
+    """Discount factors of rates r at times t.
+
+    simple: 1 / (1 + r t), annual: (1 + r)^-t, periodic: (1 + r / frequency)^(-frequency t) and
+    continuous: e^(-r t), r being in the given unit. The result is written into out when given, into
+    r itself with overwrite=True when its shape and dtype allow it, so large arrays are converted
+    without temporaries.
+    """
+    scale = check_unit(unit)
+    convention = check_convention(convention)
+    frequency = 1 if convention == "annual" else frequency
+    result = _output(r, t, out, overwrite)
+    if convention == "simple":
+        np.multiply(r, t, out=result)
+        result *= 1 / scale
+        result += 1
+        return _result(np.reciprocal(result, out=result), out)
+    if convention == "continuous":
+        np.multiply(r, t, out=result)
+        result *= -1 / scale
+    else:
+        np.multiply(r, 1 / (scale * frequency), out=result)
+        np.log1p(result, out=result)
+        result *= t
+        result *= -frequency
+    return _result(np.exp(result, out=result), out)
+
+
+def df_to_rate(df: Any, t: Any, convention: str = "annual", unit: str = "percent", frequency: int = 1,
+               out: Optional[np.ndarray] = None, overwrite: bool = False) -> Any:
+    """Rates in the given unit and convention of discount factors df at times t, inverse of rate_to_df"""
+    scale = check_unit(unit)
+    convention = check_convention(convention)
+    frequency = 1 if convention == "annual" else frequency
+    result = _output(df, t, out, overwrite)
+    if convention == "simple":
+        np.reciprocal(df, out=result)
+        result -= 1
+    else:
+        np.log(df, out=result)
+        result *= -1 / (1 if convention == "continuous" else frequency)
+    result /= t
+    if convention in ("annual", "periodic"):
+        np.expm1(result, out=result)
+        result *= frequency
+    result *= scale
+    return _result(result, out)
+
 
-def discrete_df(r, t):
-    return 1 / ((1 + r/100) ** t)
+def discrete_df(r: Any, t: Any, out: Optional[np.ndarray] = None, overwrite: bool = False) -> Any:
+    """Discount factors of annually compounded percent rates"""
+    return rate_to_df(r, t, "annual", "percent", out=out, overwrite=overwrite)
 
 
-def continuous_df(r, t):
-    return np.exp(-r/100 * t)
+def continuous_df(r: Any, t: Any, out: Optional[np.ndarray] = None, overwrite: bool = False) -> Any:
+    """Discount factors of continuously compounded percent rates"""
+    return rate_to_df(r, t, "continuous", "percent", out=out, overwrite=overwrite)
 
 
-def discrete_rate(df, t):
-    return ((1 / df) ** (1 / t)) - 1
+def discrete_rate(df: Any, t: Any, out: Optional[np.ndarray] = None, overwrite: bool = False) -> Any:
+    """Annually compounded decimal rates of discount factors"""
+    return df_to_rate(df, t, "annual", "decimal", out=out, overwrite=overwrite)
 
 
-def continuous_rate(df, t):
-    return np.log(1 / df) ** t
\ No newline at end of file
+def continuous_rate(df: Any, t: Any, out: Optional[np.ndarray] = None, overwrite: bool = False) -> Any:
+    """Continuously compounded decimal rates of discount factors, log(1 / df) / t"""
+    return df_to_rate(df, t, "continuous", "decimal", out=out, overwrite=overwrite)
@@ -0,0 +1,133 @@
+from typing import Any, Union
+import time
+
+import numpy as np
+import scipy.linalg as scl
+import scipy.optimize as sco
+from PyCurve.cubic import CubicCurve
+from PyCurve.curve import Curve
+from PyCurve.linear import LinearCurve
+from PyCurve.log_discount import INTERPOLATION_METHODS, LogDiscountCurve
+
+INSTRUMENT_TYPES = ("deposit", "fra", "swap")
+
+
+class BootstrapResult(sco.OptimizeResult):
+    """OptimizeResult of a bootstrap: x (log discount factors at the pillars), curve (Curve of percent
+    zero rates at the pillars), repricing_error (implied minus quoted rate, percent, in input order),
+    nit, success, message and wall_time (seconds)"""
+
+    def interpolator(self, method: str = "log_linear") -> Union[LinearCurve, CubicCurve, LogDiscountCurve]:
+        """Interpolator of the bootstrapped curve, 'log_linear' reproducing the bootstrap exactly"""
+        if method == "linear":
+            return LinearCurve(self.curve)
+        if method == "cubic":
+            return CubicCurve(self.curve)
+        if method in INTERPOLATION_METHODS:
+            return LogDiscountCurve(self.curve, method)
+        raise TypeError("method must be 'linear', 'cubic', 'log_linear', 'flat_forward' or 'monotone_convex'")
+
+
+class Bootstrapper:
+    """Zero curve bootstrap from deposit, FRA and par swap quotes (percent, simple rates).
+
+    instruments is a list of ("deposit", maturity), ("fra", start, end) and ("swap", maturity) tuples,
+    times in years and swaps paying frequency fixed coupons a year against a single curve. Each
+    instrument sets the discount factor at its maturity, log discount factors being linear between
+    pillars. Every repricing equation is (A0 + quote * A1) @ exp(W @ x) = b with x the pillar log
+    discount factors, so the schedule, accrual and interpolation tables A0, A1, W are built once here and
+    reused by every bootstrap. The Jacobian is lower triangular in maturity order, so each Newton step is
+    the sequential bootstrap done as a single triangular solve over all instruments.
+    """
+
+    def __init__(self, instruments: list, frequency: int = 1, tol: float = 1e-12, max_iter: int = 20) -> None:
+        self._instruments = self._is_valid_instruments(instruments)
+        self._frequency = frequency
+        self._tol = tol
+        self._max_iter = max_iter
+        maturities = np.array([instrument[-1] for instrument in self._instruments], dtype=np.float64)
+        self._order = np.argsort(maturities, kind="stable")
+        self._pillars = maturities[self._order]
+        if np.any(np.diff(self._pillars) <= 0):
+            raise ValueError("instruments must have distinct maturities")
+        self._build_tables()
+        self._trtrs = scl.get_lapack_funcs("trtrs", (self._weights,))
+
+    @staticmethod
+    def _is_valid_instruments(instruments: Any) -> list:
+        if len(instruments) == 0:
+            raise ValueError("at least one instrument is required")
+        for instrument in instruments:
+            if instrument[0] not in INSTRUMENT_TYPES:
+                raise TypeError("instrument type must be 'deposit', 'fra' or 'swap'")
+            if len(instrument) != (3 if instrument[0] == "fra" else 2):
+                raise ValueError("instruments are ('deposit', T), ('fra', start, end) or ('swap', T)")
+            if instrument[-1] <= 0 or (instrument[0] == "fra" and not 0 <= instrument[1] < instrument[2]):
+                raise ValueError("instrument times must be positive and increasing")
+        return list(instruments)
+
+    def get_attr(self, attr: str) -> Any:
+        return self.__getattribute__(attr)
+
+    def _schedule(self, instrument: tuple) -> tuple:
+        """Payment times with the fixed part and the quote-proportional part of their coefficients"""
+        maturity = instrument[-1]
+        if instrument[0] == "deposit":
+            return [maturity], [1.], [maturity]
+        if instrument[0] == "fra":
+            start = instrument[1]
+            return [start, maturity], [-1., 1.], [0., maturity - start]
+        dates = maturity - np.arange(int(np.ceil(maturity * self._frequency - 1e-9)))[::-1] / self._frequency
+        accruals = np.diff(np.concatenate([[0.], dates]))
+        fixed = np.zeros(dates.shape[0])
+        fixed[-1] = 1.
+        return dates.tolist(), fixed.tolist(), accruals.tolist()
+
+    def _build_tables(self) -> None:
+        schedules = [self._schedule(self._instruments[i]) for i in self._order]
+        self._dates = np.unique(np.concatenate([schedule[0] for schedule in schedules]))
+        n, m = len(schedules), self._dates.shape[0]
+        self._fixed = np.zeros((n, m))
+        self._accrual = np.zeros((n, m))
+        self._b = np.array([0. if self._instruments[i][0] == "fra" else 1. for i in self._order])
+        for row, (dates, fixed, accrual) in enumerate(schedules):
+            columns = np.searchsorted(self._dates, dates)
+            np.add.at(self._fixed[row], columns, fixed)
+            np.add.at(self._accrual[row], columns, accrual)
+        # log DF at every date, linear in the pillar log DFs with log DF(0) = 0
+        right = np.searchsorted(self._pillars, self._dates)
+        left_time = np.where(right > 0, self._pillars[np.maximum(right - 1, 0)], 0.)
+        weight = (self._dates - left_time) / (self._pillars[right] - left_time)
+        self._weights = np.zeros((m, n))
+        self._weights[np.arange(m), right] = weight
+        inner = right > 0
+        self._weights[np.arange(m)[inner], right[inner] - 1] = 1 - weight[inner]
+
+    def bootstrap(self, quotes: (np.ndarray, list)) -> BootstrapResult:
+        """Solve the pillar discount factors for the given quotes, in the instruments order"""
+        start = time.perf_counter()
+        quotes = np.asarray(quotes, dtype=np.float64)
+        if quotes.shape != (len(self._instruments),):
+            raise ValueError("one quote per instrument is required")
+        coefficients = self._fixed + (quotes[self._order] / 100)[:, None] * self._accrual
+        x = -self._pillars * np.log1p(quotes[self._order] / 100)
+        nit, step = 0, np.inf
+        while nit < self._max_iter and np.abs(step).max() > self._tol:
+            df = np.exp(self._weights @ x)
+            residual = coefficients @ df - self._b
+            jacobian = (coefficients * df) @ self._weights
+            step, info = self._trtrs(jacobian, residual, lower=1)
+            if info != 0:
+                raise np.linalg.LinAlgError("instrument %d cannot be repriced from the shorter pillars"
+                                            % self._order[info - 1])
+            x -= step
+            nit += 1
+        df = np.exp(self._weights @ x)
+        implied = 100 * (self._b - self._fixed @ df) / (self._accrual @ df)
+        error = np.empty_like(implied)
+        error[self._order] = implied - quotes[self._order]
+        rates = 100 * np.expm1(-x / self._pillars)
+        converged = bool(np.abs(step).max() <= self._tol)
+        return BootstrapResult(x=x, curve=Curve(self._pillars.copy(), rates), repricing_error=error, nit=nit,
+                               success=converged, message="converged" if converged else "max_iter reached",
+                               wall_time=time.perf_counter() - start)
@@ -0,0 +1,379 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional, Tuple
+import logging
+import os
+import time
+import traceback
+
+import numpy as np
+import scipy.optimize as sco
+import scipy.sparse as sp
+
+from PyCurve.actuarial_implementation import continuous_df, discrete_df
+from PyCurve.loadings import as_time_array
+
+logger = logging.getLogger(__name__)
+
+
+def panel_dtype(n_params: int) -> np.dtype:
+    """Record layout of one calibrated date: parameters, squared error sum and optimizer counters"""
+    return np.dtype([("x", np.float64, (n_params,)), ("fun", np.float64),
+                     ("nit", np.int64), ("nfev", np.int64), ("success", np.bool_)])
+
+
+CALIBRATION_METHODS = ("local", "profile", "global")
+
+
+def check_method(method: Any) -> str:
+    if method in CALIBRATION_METHODS:
+        return method
+    else:
+        raise TypeError("method must be 'local', 'profile' or 'global'")
+
+
+def minimize_sse(model: Any, x0: np.ndarray, t: np.ndarray, rt: np.ndarray) -> sco.OptimizeResult:
+    """Bounded L-BFGS-B fit of a parametric model class to one tenor grid"""
+    return sco.minimize(model._calibration_func, x0, method='L-BFGS-B', jac=True,
+                        args=(t, rt), bounds=model._boundaries)
+
+
+def tau_grid(model: Any, n_grid: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+    """Flattened grid of decay parameters, geometrically spaced inside each tau boundary"""
+    n_grid = n_grid or (60 if model._n_taus == 1 else 30)
+    axes = [np.geomspace(max(low, 0.05), high, n_grid) for low, high in model._boundaries[-model._n_taus:]]
+    return tuple(axis.ravel() for axis in np.meshgrid(*axes, indexing="ij"))
+
+
+def profile_betas(model: Any, t: np.ndarray, rt: np.ndarray,
+                  taus: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Least-squares betas and squared error sums for every grid point, solved as one batched problem.
+
+    The normal equations carry a tiny ridge so grid points with coinciding taus stay solvable.
+    """
+    loadings = model._loadings(t, *(tau[:, None] for tau in taus))
+    gram = np.einsum("gnk,gnl->gkl", loadings, loadings)
+    gram += 1e-12 * np.trace(gram, axis1=1, axis2=2)[:, None, None] * np.eye(gram.shape[-1])
+    betas = np.linalg.solve(gram, np.einsum("gnk,n->gk", loadings, rt)[..., None])[..., 0]
+    residual = np.einsum("gnk,gk->gn", loadings, betas) - rt
+    sse = np.einsum("ij,ij->i", residual, residual)
+    low, high = np.array(model._boundaries[:-model._n_taus], dtype=np.float64).T
+    sse[((betas < low) | (betas > high)).any(axis=1)] = np.inf
+    return betas, sse
+
+
+def profile_start(model: Any, t: np.ndarray, rt: np.ndarray,
+                  n_grid: Optional[int] = None) -> Tuple[np.ndarray, int]:
+    """Variable projection starting point: the betas enter linearly, so scan the taus on a grid
+    solving the betas by least squares. Returns the best feasible grid point and the grid size."""
+    taus = tau_grid(model, n_grid)
+    betas, sse = profile_betas(model, t, rt, taus)
+    best = int(np.argmin(sse))
+    x0 = np.concatenate([betas[best], [tau[best] for tau in taus]])
+    low, high = np.array(model._boundaries, dtype=np.float64).T
+    return np.clip(x0, low, high), sse.shape[0]
+
+
+def minimize_profile(model: Any, t: np.ndarray, rt: np.ndarray, n_grid: Optional[int] = None) -> sco.OptimizeResult:
+    """Profile the taus on a grid and refine the best grid point with L-BFGS-B"""
+    return minimize_sse(model, profile_start(model, t, rt, n_grid)[0], t, rt)
+
+
+def population_sse(model: Any, population: np.ndarray, t: np.ndarray, rt: np.ndarray) -> np.ndarray:
+    """Squared error sums of a whole (population x params) set of candidates in one broadcast"""
+    taus = population[:, -model._n_taus:]
+    loadings = model._loadings(t, *(taus[:, [i]] for i in range(model._n_taus)))
+    residual = np.einsum("pnk,pk->pn", loadings, population[:, :-model._n_taus]) - rt
+    return np.einsum("pn,pn->p", residual, residual)
+
+
+def global_candidates(model: Any, t: np.ndarray, rt: np.ndarray, population_size: Optional[int] = None,
+                      generations: int = 100, crossover: float = 0.9, seed: Optional[int] = 0,
+                      n_candidates: int = 3, patience: int = 10) -> Tuple[np.ndarray, int]:
+    """Differential evolution (current-to-best/1/bin with dithered mutation) starting points, each
+    generation of trial vectors being evaluated with a single population_sse call. Returns the
+    n_candidates best distinct members, best first, as a (candidates x params) array and the
+    evaluation count.
+
+    The population holds the model default start and the profile grid start, the other betas being
+    sampled within the scale of the observed rates and taus log-uniformly; mutants are clipped to the
+    model boundaries (an unbounded beta0 being capped at 30 like the other betas). The search stops
+    once the best squared error sum has not improved for patience generations.
+    """
+    rng = np.random.default_rng(seed)
+    n_params = len(model._boundaries)
+    n_betas = n_params - model._n_taus
+    population_size = max(population_size or 10 * n_params, 4)
+    low, high = np.array(model._boundaries, dtype=np.float64).T
+    high = np.minimum(high, 30)
+    scale = 2 * np.abs(rt).max() + 1
+    tau_low = np.log(np.maximum(low[n_betas:], 0.05))
+    population = np.concatenate([
+        rng.uniform(np.maximum(low[:n_betas], -scale), np.minimum(high[:n_betas], scale), (population_size, n_betas)),
+        np.exp(rng.uniform(tau_low, np.log(high[n_betas:]), (population_size, model._n_taus)))], axis=1)
+    profile, grid_size = profile_start(model, t, rt)
+    population[0] = np.clip(np.asarray(model._x0, dtype=np.float64), low, high)
+    population[1] = np.clip(profile, low, high)
+    fitness = population_sse(model, population, t, rt)
+    evaluations = population_size + grid_size
+    rows = np.arange(population_size)
+    best_fitness, stalled = fitness.min(), 0
+    for _ in range(generations):
+        b, c = rng.permuted(np.tile(rows, (2, 1)), axis=1)
+        weight = rng.uniform(0.5, 1., (population_size, 1))
+        best = population[np.argmin(fitness)]
+        mutant = np.clip(population + weight * (best - population + population[b] - population[c]), low, high)
+        cross = rng.random((population_size, n_params)) < crossover
+        cross[rows, rng.integers(n_params, size=population_size)] = True
+        trial = np.where(cross, mutant, population)
+        trial_fitness = population_sse(model, trial, t, rt)
+        evaluations += population_size
+        improved = trial_fitness < fitness
+        population[improved] = trial[improved]
+        fitness[improved] = trial_fitness[improved]
+        if fitness.min() < best_fitness * (1 - 1e-10):
+            best_fitness, stalled = fitness.min(), 0
+        else:
+            stalled += 1
+            if stalled >= patience:
+                break
+    order = np.argsort(fitness, kind="stable")
+    _, first = np.unique(population[order], axis=0, return_index=True)
+    return population[order[np.sort(first)[:n_candidates]]], evaluations
+
+
+def global_start(model: Any, t: np.ndarray, rt: np.ndarray, population_size: Optional[int] = None,
+                 generations: int = 100, crossover: float = 0.9,
+                 seed: Optional[int] = 0) -> Tuple[np.ndarray, int]:
+    """Best differential evolution candidate of global_candidates and the evaluation count"""
+    candidates, evaluations = global_candidates(model, t, rt, population_size, generations, crossover, seed, 1)
+    return candidates[0], evaluations
+
+
+class CalibrationReport(sco.OptimizeResult):
+    """OptimizeResult of a single curve fit extended with the calibration diagnostics
+
+    Besides the optimizer fields (x, fun, nit, nfev, message, success) it holds method, sse, rmse,
+    converged, wall_time (seconds), timings (seconds per phase) and grid_evaluations, the number of
+    candidate parameter vectors scanned by the profile grid or the global search. For the global search
+    nit and nfev add up every local polishing run, not only the one kept.
+    """
+
+
+def _build_report(model: Any, result: sco.OptimizeResult, method: str, n_observations: int, start: float,
+                  timings: dict, grid_evaluations: int,
+                  callback: Optional[Callable[[CalibrationReport], None]]) -> CalibrationReport:
+    report = CalibrationReport(result)
+    report.update(method=method, sse=float(result.fun), rmse=float(np.sqrt(result.fun / max(n_observations, 1))),
+                  converged=bool(result.success), wall_time=time.perf_counter() - start, timings=timings,
+                  grid_evaluations=grid_evaluations)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s %s fit: sse=%.6g nit=%d nfev=%d grid=%d converged=%s wall_time=%.3es %s",
+                     getattr(model, "__name__", type(model).__name__), method, report.sse, report.nit,
+                     report.nfev, grid_evaluations, report.converged, report.wall_time, timings)
+    if callback is not None:
+        callback(report)
+    return report
+
+
+def fit(model: Any, t: np.ndarray, rt: np.ndarray, method: str = "local",
+        callback: Optional[Callable[[CalibrationReport], None]] = None) -> CalibrationReport:
+    """Fit a single curve with the requested calibration method and build its report.
+
+    The report is logged at DEBUG level on the PyCurve.calibration logger and handed to callback.
+    """
+    start = time.perf_counter()
+    timings = {}
+    grid_evaluations = 0
+    if check_method(method) == "profile":
+        x0, grid_evaluations = profile_start(model, t, rt)
+        timings["grid"] = time.perf_counter() - start
+    elif method == "global":
+        candidates, grid_evaluations = global_candidates(model, t, rt)
+        timings["global"] = time.perf_counter() - start
+        optimize_start = time.perf_counter()
+        # polish the best candidates and the plain local fit, keeping the lowest squared error sum
+        results = [minimize_sse(model, x0, t, rt) for x0 in candidates] + [minimize_sse(model, model._x0, t, rt)]
+        timings["optimize"] = time.perf_counter() - optimize_start
+        result = sco.OptimizeResult(min(results, key=lambda candidate: candidate.fun))
+        for count in ("nit", "nfev", "njev"):
+            if all(count in candidate for candidate in results):
+                result[count] = sum(candidate[count] for candidate in results)
+        return _build_report(model, result, method, t.shape[0], start, timings, grid_evaluations, callback)
+    else:
+        x0 = model._x0
+    optimize_start = time.perf_counter()
+    result = minimize_sse(model, x0, t, rt)
+    timings["optimize"] = time.perf_counter() - optimize_start
+    return _build_report(model, result, method, t.shape[0], start, timings, grid_evaluations, callback)
+
+
+COMPOUNDINGS = ("discrete", "continuous")
+
+
+def discount_and_derivative(rate: np.ndarray, t: np.ndarray, compounding: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Discount factors of percent rates and their derivative with respect to the rate"""
+    if compounding == "discrete":
+        df = discrete_df(rate, t)
+        return df, -t / 100 * df / (1 + rate / 100)
+    elif compounding == "continuous":
+        df = continuous_df(rate, t)
+        return df, -t / 100 * df
+    else:
+        raise TypeError("compounding must be 'discrete' or 'continuous'")
+
+
+def _price_func(x: np.ndarray, model: Any, cashflows: Any, t: np.ndarray, prices: np.ndarray,
+                weights: np.ndarray, compounding: str) -> Tuple[float, np.ndarray]:
+    """Weighted squared price errors of all bonds, discounting the whole cash-flow matrix in one pass"""
+    rate, jac = model._rate_and_jac(x, t)
+    df, d_df = discount_and_derivative(rate, t, compounding)
+    residual = weights * (cashflows @ df - prices)
+    price_jac = cashflows @ (jac * d_df).T
+    return float(residual @ residual), 2 * (price_jac.T @ (weights * residual))
+
+
+def bond_yields(cashflows: Any, t: np.ndarray, prices: np.ndarray, compounding: str = "discrete",
+                iterations: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """Percent yields and Macaulay durations of every bond, all bonds being solved together by
+    vectorized Newton steps over the non-zero cash flows"""
+    flows = sp.coo_matrix(cashflows)
+    rows, times, amounts = flows.row, t[flows.col], flows.data
+    n_bonds = flows.shape[0]
+    y = np.zeros(n_bonds)
+    for _ in range(iterations):
+        df, d_df = discount_and_derivative(y[rows], times, compounding)
+        step = ((np.bincount(rows, amounts * df, n_bonds) - prices) /
+                np.bincount(rows, amounts * d_df, n_bonds))
+        y -= np.nan_to_num(step)
+        if np.abs(step).max(initial=0) < 1e-12:
+            break
+    df = discount_and_derivative(y[rows], times, compounding)[0]
+    duration = np.bincount(rows, amounts * times * df, n_bonds) / np.bincount(rows, amounts * df, n_bonds)
+    return y, duration
+
+
+def price_weights(n_bonds: int, duration: np.ndarray, weights: Any) -> np.ndarray:
+    """Per-bond weights: ones, the given array, or inverse Macaulay durations when weights is 'duration'"""
+    if weights is None:
+        return np.ones(n_bonds)
+    if isinstance(weights, str):
+        if weights != "duration":
+            raise TypeError("weights must be None, 'duration' or an array")
+        return 1 / np.maximum(duration, 1e-6)
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (n_bonds,):
+        raise ValueError("weights must hold one value per bond")
+    return weights
+
+
+def fit_prices(model: Any, cashflows: Any, t: (np.ndarray, list), prices: (np.ndarray, list), weights: Any = None,
+               compounding: str = "discrete", x0: Optional[np.ndarray] = None,
+               callback: Optional[Callable[[CalibrationReport], None]] = None) -> CalibrationReport:
+    """Fit a parametric model to bond dirty prices.
+
+    cashflows is a (bonds x payment dates) dense array or scipy.sparse matrix whose columns are paid at
+    times t (years), prices the dirty prices in the same units. Unless x0 is given, the search starts
+    from a profile fit of the bond yields against their durations. Every iteration then discounts all
+    cash flows through the model rates in a single vectorized pass, with a closed-form gradient.
+    """
+    start = time.perf_counter()
+    t = as_time_array(t)
+    prices = np.asarray(prices, dtype=np.float64)
+    if cashflows.shape != (prices.shape[0], t.shape[0]):
+        raise ValueError("cashflows must be a (bonds x payment dates) matrix matching prices and t")
+    if compounding not in COMPOUNDINGS:
+        raise TypeError("compounding must be 'discrete' or 'continuous'")
+    if not sp.issparse(cashflows):
+        cashflows = np.asarray(cashflows, dtype=np.float64)
+    y, duration = bond_yields(cashflows, t, prices, compounding)
+    weights = price_weights(prices.shape[0], duration, weights)
+    timings = {"yields": time.perf_counter() - start}
+    grid_evaluations = 0
+    if x0 is None:
+        order = np.argsort(duration)
+        x0, grid_evaluations = profile_start(model, duration[order], y[order])
+        timings["grid"] = time.perf_counter() - start - timings["yields"]
+    optimize_start = time.perf_counter()
+    result = sco.minimize(_price_func, x0, method='L-BFGS-B', jac=True,
+                          args=(model, cashflows, t, prices, weights, compounding), bounds=model._boundaries,
+                          options={"ftol": 1e-14, "gtol": 1e-10})
+    timings["optimize"] = time.perf_counter() - optimize_start
+    return _build_report(model, result, "price", prices.shape[0], start, timings, grid_evaluations, callback)
+
+
+def calibrate_panel(model: Any, t: (np.ndarray, list), rates: np.ndarray,
+                    x0: Optional[np.ndarray] = None, warm_start: bool = True) -> np.ndarray:
+    """Calibrate a (dates x tenors) panel of rates, seeding each date with the previous solution.
+
+    Missing quotes can be left as NaN and are ignored for that date. Returns one record of
+    panel_dtype per date.
+    """
+    t = as_time_array(t)
+    rates = np.asarray(rates, dtype=np.float64)
+    if rates.ndim != 2 or rates.shape[1] != t.shape[0]:
+        raise ValueError("rates must be a (dates x tenors) panel matching the tenor grid")
+    cold_start = np.array(model._x0 if x0 is None else x0, dtype=np.float64)
+    x = cold_start
+    results = np.zeros(rates.shape[0], dtype=panel_dtype(cold_start.shape[0]))
+    for i, rt in enumerate(rates):
+        quoted = np.isfinite(rt)
+        res = minimize_sse(model, x, t[quoted], rt[quoted])
+        results[i] = (res.x, res.fun, res.nit, res.nfev, res.success)
+        if warm_start and np.isfinite(res.x).all():
+            x = res.x
+        else:
+            x = cold_start
+    return results
+
+
+def _calibrate_shared_chunk(model: Any, name: str, shape: Tuple[int, int], t: np.ndarray, start: int, stop: int,
+                            x0: Optional[np.ndarray], warm_start: bool) -> np.ndarray:
+    """Worker side of calibrate_parallel: attach to the shared panel and fit rows start:stop.
+
+    Every view on the shared buffer is dropped before closing it, including those held by the frames of
+    a failing fit, so close() cannot mask the worker error with a BufferError.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    rates = None
+    try:
+        rates = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        return calibrate_panel(model, t, rates[start:stop], x0, warm_start)
+    except BaseException as error:
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        del rates
+        shm.close()
+
+
+def calibrate_parallel(model: Any, t: (np.ndarray, list), rates: np.ndarray, x0: Optional[np.ndarray] = None,
+                       warm_start: bool = True, max_workers: Optional[int] = None,
+                       chunk_size: Optional[int] = None) -> np.ndarray:
+    """Spread a (curves x tenors) panel over a process pool, results being returned in input order.
+
+    The panel is placed once in shared memory and each worker fits contiguous chunks of rows with
+    calibrate_panel, so warm starts still apply inside a chunk and nothing large is pickled.
+    """
+    t = as_time_array(t)
+    rates = np.ascontiguousarray(rates, dtype=np.float64)
+    if rates.ndim != 2 or rates.shape[1] != t.shape[0]:
+        raise ValueError("rates must be a (dates x tenors) panel matching the tenor grid")
+    n_curves = rates.shape[0]
+    max_workers = max_workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, -(-n_curves // (4 * max_workers)))
+    if n_curves == 0:
+        return calibrate_panel(model, t, rates, x0, warm_start)
+    shm = shared_memory.SharedMemory(create=True, size=rates.nbytes)
+    try:
+        shared = np.ndarray(rates.shape, dtype=np.float64, buffer=shm.buf)
+        shared[:] = rates
+        del shared
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_calibrate_shared_chunk, model, shm.name, rates.shape, t,
+                                       start, min(start + chunk_size, n_curves), x0, warm_start)
+                       for start in range(0, n_curves, chunk_size)]
+            return np.concatenate([future.result() for future in futures])
+    finally:
+        shm.close()
+        shm.unlink()
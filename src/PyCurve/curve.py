@@ -6,32 +6,106 @@ import matplotlib.pyplot as plt
 
 
 
+CURVE_PRECISIONS: dict = {"float64": np.float64, "float32": np.float32}
+
+
 class Curve:
+    """Term structure held as two read-only contiguous arrays of times and rates.
+
+    Inputs are converted and validated once (1-d, same length, finite, times sorted) and stored
+    read-only, so consumers use them without further conversion and curves can share them zero-copy.
+    Slicing with a positive step returns a Curve of views on the same memory.
+    """
+    __slots__ = ("_t", "_rt")
+
+    def __init__(self, t: (np.ndarray, list), rt: (np.ndarray, list), precision: str = "float64") -> None:
+        dtype = self._is_valid_precision(precision)
+        self._t = self._is_sorted(self._is_valid_attr(t, dtype))
+        self._rt = self._is_valid_attr(rt, dtype)
+        self._is_same_length(self._t, self._rt)
 
-    def __init__(self, t: (np.ndarray, list), rt: (np.ndarray, list)) -> None:
-        self._t = self._is_valid_attr(t)
-        self._rt = self._is_valid_attr(rt)
+    @classmethod
+    def _from_views(cls, t: np.ndarray, rt: np.ndarray) -> "Curve":
+        """Wrap already validated read-only arrays without copying them"""
+        curve = cls.__new__(cls)
+        curve._t = t
+        curve._rt = rt
+        return curve
 
     @property
-    def get_time(self) -> (np.ndarray, list):
+    def get_time(self) -> np.ndarray:
         """Time getter"""
-        return self.__getattribute__("_t")
+        return self._t
 
     @property
-    def get_rate(self) -> (np.ndarray, list):
+    def get_rate(self) -> np.ndarray:
         """Rate getter"""
-        return self.__getattribute__("_rt")
+        return self._rt
+
+    @property
+    def precision(self) -> str:
+        return self._t.dtype.name
+
+    @staticmethod
+    def _is_valid_precision(precision: Any) -> type:
+        if precision in CURVE_PRECISIONS:
+            return CURVE_PRECISIONS[precision]
+        else:
+            raise TypeError("precision must be 'float64' or 'float32'")
 
     @staticmethod
-    def _is_valid_attr(attr: Any) -> (np.ndarray, list):
+    def _is_valid_attr(attr: Any, dtype: type = np.float64) -> np.ndarray:
+        """Read-only contiguous 1-d array of finite values, reusing attr itself when it already is one"""
         assert isinstance(attr, (np.ndarray, list)), "Class Constructor takes only numpy arrays or list as arguments"
+        if not (isinstance(attr, np.ndarray) and attr.dtype == dtype and attr.flags.c_contiguous
+                and not attr.flags.writeable):
+            attr = np.array(attr, dtype=dtype)
+            attr.setflags(write=False)
+        if attr.ndim != 1:
+            raise ValueError("Curve times and rates must be 1-d")
+        if not np.isfinite(attr).all():
+            raise ValueError("Curve times and rates must be finite")
         return attr
 
+    @staticmethod
+    def _is_sorted(t: np.ndarray) -> np.ndarray:
+        if np.any(t[1:] < t[:-1]):
+            raise ValueError("Curve times must be sorted in increasing order")
+        return t
+
+    @staticmethod
+    def _is_same_length(t: np.ndarray, rt: np.ndarray) -> None:
+        if t.shape != rt.shape:
+            raise ValueError("Curve times and rates must have the same length")
+
     def set_time(self, t: (np.ndarray, list)) -> None:
-        self.__setattr__("_t", self._is_valid_attr(t))
+        t = self._is_sorted(self._is_valid_attr(t, self._t.dtype.type))
+        self._is_same_length(t, self._rt)
+        self._t = t
 
     def set_rate(self, rt: (np.ndarray, list)) -> None:
-        self.__setattr__("_rt", self._is_valid_attr(rt))
+        rt = self._is_valid_attr(rt, self._rt.dtype.type)
+        self._is_same_length(self._t, rt)
+        self._rt = rt
+
+    def __len__(self) -> int:
+        return self._t.shape[0]
+
+    def __getitem__(self, key: Any) -> "Curve":
+        """Sub-curve: views for slices with a positive step and integers (a one-point curve), a validated copy
+        for index arrays and masks"""
+        if isinstance(key, (int, np.integer)):
+            if not -len(self) <= key < len(self):
+                raise IndexError("Curve index out of range")
+            key = slice(key, key + 1 if key != -1 else None)
+        if isinstance(key, slice) and (key.step is None or key.step > 0):
+            return self._from_views(self._t[key], self._rt[key])
+        if isinstance(key, slice):
+            raise ValueError("Curve slices must keep times increasing")
+        return Curve(self._t[key], self._rt[key], self.precision)
+
+    def __repr__(self) -> str:
+        return "Curve(%d points, %s)" % (len(self), self.precision)
 
     def plot_curve(self) -> None:
         fig, ax = plt.subplots(1)
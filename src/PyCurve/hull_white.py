@@ -1,23 +1,25 @@
-from typing import Union, Any
+from typing import Any, Optional, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
 
 import scipy.optimize as sco
-from PyCurve.simulation import Simulation
+from PyCurve.simulation import (ShortRateSimulator, Simulation, check_scheme, exact_paths, ou_zero_coupon,
+                                standard_normals)
 from PyCurve.curve import Curve
 from PyCurve.linear import LinearCurve
 from PyCurve.cubic import CubicCurve
+from PyCurve.log_discount import INTERPOLATION_METHODS, LogDiscountCurve
 from PyCurve.svensson_nelson_siegel import NelsonSiegelAugmented
 from PyCurve.bjork_christensen_augmented import BjorkChristensenAugmented
 
 
 
 
-class HullWhite:
+class HullWhite(ShortRateSimulator):
 
     def __init__(self, alpha: float, sigma: float, rt: float, time: float,
-                 delta_time: float, instantaneous_forward: Curve, method: str) -> None:
+                 delta_time: float, instantaneous_forward: Curve, method: str, seed: Any = None) -> None:
         self._alpha = alpha
         self._sigma = sigma
         self._rt = rt
@@ -25,16 +27,33 @@ class HullWhite:
         self._steps = int(time / delta_time)
         self._f_curve = self._is_valid_curve(instantaneous_forward)
         self._method = self.set_method(method)
+        self._interpolator = None
+        self._theta = None
+        self._phi = None
+        self._seed = self._is_valid_seed(seed)
+        self._rng = np.random.default_rng(self._seed)
 
     def get_attr(self, attr: str) -> Union[float, int]:
         return self.__getattribute__(attr)
 
+    def set_attr(self, attr: str, x: Any) -> None:
+        """Attributes setter, dropping the cached interpolator and theta table they depend on"""
+        if attr == "_f_curve":
+            x = self._is_valid_curve(x)
+        if attr == "_method":
+            x = self.set_method(x)
+        super().set_attr(attr, x)
+        if attr in ("_f_curve", "_method"):
+            self._interpolator = None
+        self._theta = None
+        self._phi = None
+
     @staticmethod
     def set_method(method: Any) -> str:
-        if method in ["cubic", "linear"]:
+        if method in ["cubic", "linear"] or method in INTERPOLATION_METHODS:
             return method
         else:
-            raise TypeError("method must be 'linear' , 'cubic' ")
+            raise TypeError("method must be 'linear' , 'cubic', 'log_linear', 'flat_forward' or 'monotone_convex' ")
 
     @staticmethod
     def _is_valid_curve(curve: Any) -> Curve:
@@ -44,31 +63,112 @@ class HullWhite:
         return curve
 
     def _sigma_part(self, n: int) -> float:
-        return self.get_attr("_sigma") * np.sqrt(self.get_attr("_dt")) * np.random.normal(size=n)
+        return self.get_attr("_sigma") * np.sqrt(self.get_attr("_dt")) * self._rng.standard_normal(n)
+
+    @staticmethod
+    def _zero_curve(forward: Curve) -> Curve:
+        """Percent annually compounded zero rates of a forward curve, integrating the forwards by trapezoids
+        from t = 0 where the first forward is held flat"""
+        t = np.asarray(forward.get_time, dtype=np.float64)
+        f = np.asarray(forward.get_rate, dtype=np.float64)
+        if t[0] > 0:
+            t, f = np.concatenate([[0.], t]), np.concatenate([f[:1], f])
+        integral = np.cumsum((f[1:] + f[:-1]) / 2 * np.diff(t))
+        return Curve(t[1:], 100 * np.expm1(integral / t[1:]))
+
+    def _forward_interpolator(self) -> Union[LinearCurve, CubicCurve, LogDiscountCurve]:
+        """Interpolator of the forward curve, built once and rebuilt only if the curve arrays are replaced.
+        'linear' and 'cubic' interpolate the forwards themselves, the log discount methods the zero curve
+        they integrate to."""
+        source = (self._f_curve.get_time, self._f_curve.get_rate)
+        if self._interpolator is None or any(a is not b for a, b in zip(self._interpolator[0], source)):
+            if self._method == "linear":
+                self._interpolator = (source, LinearCurve(self._f_curve))
+            elif self._method == "cubic":
+                self._interpolator = (source, CubicCurve(self._f_curve))
+            else:
+                self._interpolator = (source, LogDiscountCurve(self._zero_curve(self._f_curve), self._method))
+            self._theta = None
+            self._phi = None
+        return self._interpolator[1]
 
     def _interp_forward(self, t) -> float:
-        curve_interp = None
-        if self._method == "linear":
-            curve_interp = LinearCurve(self._f_curve)
-        elif self._method == "cubic":
-            curve_interp = CubicCurve(self._f_curve)
-        return curve_interp.d_rate(t)
+        interpolator = self._forward_interpolator()
+        if isinstance(interpolator, LogDiscountCurve):
+            return interpolator.instantaneous_forward(t) / 100
+        return interpolator.d_rate(t)
 
     def _theta_part(self, t) -> float:
         sigma = (np.power(self._sigma, 2) / (2 * self._alpha)) * (1 - np.exp(-2 * self._alpha * t))
         return (self._interp_forward(t) - self._interp_forward(t - self._dt)) + self._alpha * self._interp_forward(
             t) + sigma
 
+    def theta_table(self) -> np.ndarray:
+        """theta(t) on the simulation grid t = i * dt (entry 0 unused), cached until a parameter changes"""
+        self._forward_interpolator()
+        if self._theta is None:
+            theta = np.zeros(self._steps)
+            theta[1:] = self._theta_part(np.arange(1, self._steps) * self._dt)
+            theta.setflags(write=False)
+            self._theta = theta
+        return self._theta
+
+    def phi_table(self) -> tuple:
+        """Deterministic part phi(t) = f(t) + sigma^2 / (2 alpha^2) (1 - e^-alpha t)^2 of the short rate on the
+        grid t = i * dt and its integral over every step, Simpson's rule on f and exact on the convexity term.
+        The forward curve has to cover [0, time]. Cached until a parameter changes."""
+        self._forward_interpolator()
+        if self._phi is None:
+            a, sigma, dt = self._alpha, self._sigma, self._dt
+            t = np.arange(self._steps + 1) * dt
+            forward = self._interp_forward(t)
+            middle = self._interp_forward(t[:-1] + dt / 2)
+            convexity = sigma ** 2 / (2 * a ** 2)
+            phi = forward[:-1] + convexity * np.expm1(-a * t[:-1]) ** 2
+            decay = np.exp(-a * t)
+            squared = np.exp(-2 * a * t)
+            integral = (dt / 6 * (forward[:-1] + 4 * middle + forward[1:])
+                        + convexity * (dt + 2 * np.diff(decay) / a - np.diff(squared) / (2 * a)))
+            phi.setflags(write=False)
+            integral.setflags(write=False)
+            self._phi = (phi, integral)
+        return self._phi
+
     def _mu_dt(self, rt: np.ndarray, t) -> float:
         return self.get_attr("_alpha") * (self._theta_part(t) - rt) * self.get_attr("_dt")
 
-    def simulate_paths(self, n: int) -> np.array:
+    def zero_coupon_price(self) -> np.ndarray:
+        """Analytic zero-coupon prices at the simulated times dt, 2 dt, ... from phi_table, the initial
+        discount curve when rt is the initial forward f(0, 0)"""
+        phi, integral = self.phi_table()
+        return ou_zero_coupon(self._rt - phi[0], integral, self._alpha, self._sigma, self._dt)
+
+    def simulate_paths(self, n: int, scheme: str = "euler", sampling: str = "plain",
+                       control_variate: bool = False, rng: Optional[np.random.Generator] = None) -> Simulation:
+        """n short rate paths by Euler steps, or sampled exactly around phi with their step integrals
+        (scheme='exact'), which reprices the initial forward curve on any grid.
+
+        sampling draws the shocks as 'plain' normals, 'antithetic' pairs or scrambled 'sobol' points, and
+        control_variate (exact scheme only) attaches the analytic one-step bond price as a control.
+        Sobol sampling keeps its balance properties only for a power of two n, antithetic needs an even n.
+        Shocks come from rng, the model generator seeded at construction by default.
+        """
+        rng = self._rng if rng is None else rng
+        if check_scheme(scheme) == "exact":
+            phi, integral = self.phi_table()
+            return exact_paths(self._rt - phi[0], phi, integral, self._alpha, self._sigma, self._dt, n,
+                               sampling, control_variate, rng)
+        if control_variate:
+            raise ValueError("control variates need scheme='exact'")
         simulation = np.zeros(shape=(self.get_attr("_steps"), n))
         simulation[0, :] = self._rt
+        theta = self.theta_table()
+        shocks = standard_normals(self.get_attr("_steps") - 1, n, sampling, rng=rng)[0]
+        shocks *= self.get_attr("_sigma") * np.sqrt(self.get_attr("_dt"))
         for i in range(1, self.get_attr("_steps"), 1):
-            dr = self._mu_dt(simulation[i - 1, :], i * self.get_attr("_dt")) + self._sigma_part(n)
+            dr = self._alpha * (theta[i] - simulation[i - 1, :]) * self._dt + shocks[i - 1]
             simulation[i, :] = simulation[i - 1, :] + dr
-        return Simulation(simulation, self.get_attr("_dt"))
+        return Simulation(simulation, self.get_attr("_dt"), sampling=sampling)
 
     @staticmethod
     def plot_calibrated(simul: Simulation, curve: Curve) -> None:
@@ -22,7 +22,7 @@ class LinearCurve:
 
     def df_t(self, t: Union[np.ndarray, Iterable, int, float]) -> Union[np.ndarray, Iterable, int, float]:
         """Given a maturity return a discount factor"""
-        return discrete_df(self.d_rate(t), t)
+        return discrete_df(self.d_rate(t), t, overwrite=True)
 
     def forward(self, t_1: Union[np.ndarray, Iterable, int, float],
                 t_2: Union[np.ndarray, Iterable, int, float]) -> Union[np.ndarray, Iterable, int, float]:
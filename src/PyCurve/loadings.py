@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Tuple, Union
+import threading
+
+import numpy as np
+
+PRECISIONS: dict = {"float32": np.float32, "float64": np.float64, "longdouble": np.longdouble}
+
+
+def check_precision(precision: Any) -> str:
+    if precision in PRECISIONS:
+        return precision
+    else:
+        raise TypeError("precision must be 'float32', 'float64' or 'longdouble'")
+
+
+def _scaled_time(t, tau, precision: str) -> np.ndarray:
+    dtype = PRECISIONS[precision]
+    return np.asarray(t, dtype=dtype) / np.asarray(tau, dtype=dtype)
+
+
+def _slope(x: np.ndarray, decay: np.ndarray) -> np.ndarray:
+    """(1 - e^-x) / x through expm1 so small x keeps full precision, with its limit 1 at x = 0"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(x == 0, 1, -np.expm1(-x) / x).astype(decay.dtype, copy=False)
+
+
+def decay_loadings(t, tau, precision: str = "float64") -> Tuple[np.ndarray, np.ndarray]:
+    """Slope (1 - e^-x) / x and curvature (1 - e^-x) / x - e^-x loadings with x = t / tau,
+    computed in the given precision and well defined at t = 0"""
+    x = _scaled_time(t, tau, precision)
+    decay = np.exp(-x)
+    slope = _slope(x, decay)
+    return slope, slope - decay
+
+
+def decay_loadings_dtau(t, tau: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Slope and curvature loadings followed by their derivatives with respect to tau"""
+    x = _scaled_time(t, tau, "float64")
+    decay = np.exp(-x)
+    slope = _slope(x, decay)
+    curvature = slope - decay
+    return slope, curvature, curvature / tau, (curvature - x * decay) / tau
+
+
+def forward_loadings(t, tau, precision: str = "float64") -> Tuple[np.ndarray, np.ndarray]:
+    """Instantaneous forward loadings d(t L)/dt of the slope and curvature: e^-x and x e^-x"""
+    x = _scaled_time(t, tau, precision)
+    decay = np.exp(-x)
+    return decay, x * decay
+
+
+def forward_loadings_dt(t, tau, precision: str = "float64") -> Tuple[np.ndarray, np.ndarray]:
+    """Time derivatives of the forward loadings: -e^-x / tau and (1 - x) e^-x / tau"""
+    x = _scaled_time(t, tau, precision)
+    decay = np.exp(-x) / np.asarray(tau, dtype=x.dtype)
+    return -decay, (1 - x) * decay
+
+
+def linear_loading(t, tau, precision: str = "float64") -> np.ndarray:
+    """Linear loading t / (2 tau) of the augmented Bjork Christensen model"""
+    return _scaled_time(t, tau, precision) / 2
+
+
+def sum_squared_errors(jac: np.ndarray, residual: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Sum of squared residuals and its gradient given d(rate)/d(param) as a (params x tenors) matrix"""
+    return float(residual @ residual), 2 * (jac @ residual)
+
+
+def as_time_array(t: Union[np.ndarray, list, float]) -> np.ndarray:
+    """Contiguous float64 view of a tenor grid"""
+    return np.ascontiguousarray(t, dtype=np.float64)
+
+
+class LoadingCache:
+    """Bounded LRU cache of factor loading matrices keyed on (model type, taus, precision, tenor grid).
+
+    Entries are read-only so the same matrix can be shared by every model instance evaluating that
+    grid, re-pricing under new betas then costs a single matrix-vector product. The cache is bounded
+    both in number of entries and in total bytes. Grids larger than max_grid_bytes (one-off plotting
+    or bulk evaluation grids) are built without being hashed or kept, as is everything evaluated
+    inside a bypass() block.
+    """
+
+    def __init__(self, maxsize: int = 128, max_bytes: int = 256 * 2 ** 20, max_grid_bytes: int = 2 ** 16) -> None:
+        self._maxsize = maxsize
+        self._max_bytes = max_bytes
+        self._max_grid_bytes = max_grid_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    @contextmanager
+    def bypass(self) -> Iterator[None]:
+        """Evaluate without reading or filling the cache in the current thread"""
+        previous = getattr(self._local, "bypass", False)
+        self._local.bypass = True
+        try:
+            yield
+        finally:
+            self._local.bypass = previous
+
+    def get(self, model: type, taus: tuple, precision: str, t, build: Callable[[], np.ndarray]) -> np.ndarray:
+        grid = np.asarray(t)
+        if grid.nbytes > self._max_grid_bytes or getattr(self._local, "bypass", False):
+            with self._lock:
+                self.bypassed += 1
+            return build()
+        key = (model.__name__, taus, precision, grid.dtype.str, grid.shape, hash(grid.tobytes()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and np.array_equal(entry[0], grid):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        matrix = build()
+        matrix.setflags(write=False)
+        if matrix.nbytes <= self._max_bytes:
+            self._store(key, grid.copy(), matrix)
+        return matrix
+
+    def _store(self, key: tuple, grid: np.ndarray, matrix: np.ndarray) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[1].nbytes + previous[0].nbytes
+            self._entries[key] = (grid, matrix)
+            self._nbytes += matrix.nbytes + grid.nbytes
+            while len(self._entries) > self._maxsize or self._nbytes > self._max_bytes:
+                old_grid, old_matrix = self._entries.popitem(last=False)[1]
+                self._nbytes -= old_matrix.nbytes + old_grid.nbytes
+
+    def cache_info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "bypassed": self.bypassed, "size": len(self._entries),
+                "maxsize": self._maxsize, "nbytes": self._nbytes, "max_bytes": self._max_bytes,
+                "max_grid_bytes": self._max_grid_bytes}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.bypassed = 0
+
+
+loading_cache = LoadingCache()
@@ -0,0 +1,163 @@
+from typing import Any, Iterable, Optional, Tuple, Union
+
+import numpy as np
+from PyCurve.curve import Curve
+
+INTERPOLATION_METHODS = ("log_linear", "flat_forward", "monotone_convex")
+
+
+def check_interpolation(method: Any) -> str:
+    if method in INTERPOLATION_METHODS:
+        return method
+    else:
+        raise TypeError("method must be 'log_linear', 'flat_forward' or 'monotone_convex'")
+
+
+def _node_forwards(knots: np.ndarray, f_d: np.ndarray) -> np.ndarray:
+    """Hagan-West instantaneous forwards at the knots, collared to [0, 2 f_d] where the neighbouring
+    discrete forwards are positive so positive curves keep positive forwards"""
+    if f_d.shape[0] == 1:
+        return np.repeat(f_d, 2)
+    widths = np.diff(knots)
+    f = np.empty(f_d.shape[0] + 1)
+    f[1:-1] = (widths[:-1] * f_d[1:] + widths[1:] * f_d[:-1]) / (widths[:-1] + widths[1:])
+    f[0] = f_d[0] - 0.5 * (f[1] - f_d[0])
+    f[-1] = f_d[-1] - 0.5 * (f[-2] - f_d[-1])
+    low = np.concatenate([f_d[:1], np.minimum(f_d[:-1], f_d[1:]), f_d[-1:]])
+    positive = low > 0
+    f[positive] = np.clip(f[positive], 0, 2 * low[positive])
+    return f
+
+
+def _monotone_convex_coefficients(f_d: np.ndarray, f: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Breakpoint eta and cubic coefficients of G(x) = integral of g = f - f_d over [0, x] on every interval.
+
+    Row 2i holds the coefficients of G on [0, eta) in powers of x, row 2i + 1 those on [eta, 1] in
+    powers of x - eta, following the four regions of Hagan and West (2006).
+    """
+    g0, g1 = f[:-1] - f_d, f[1:] - f_d
+    eta = np.full(f_d.shape[0], np.inf)
+    lower = np.zeros((f_d.shape[0], 4))
+    upper = np.zeros((f_d.shape[0], 4))
+    zero = (g0 == 0) & (g1 == 0)
+    quadratic = ((g0 < 0) & (-0.5 * g0 <= g1) & (g1 <= -2 * g0)) | ((g0 > 0) & (-0.5 * g0 >= g1) & (g1 >= -2 * g0))
+    flat_then_rising = ~quadratic & (((g0 < 0) & (g1 > -2 * g0)) | ((g0 > 0) & (g1 < -2 * g0)))
+    falling_then_flat = ~quadratic & (((g0 > 0) & (g1 < 0)) | ((g0 < 0) & (g1 > 0))) & ~flat_then_rising
+    same_sign = ~(zero | quadratic | flat_then_rising | falling_then_flat)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = quadratic
+        lower[m] = np.stack([0 * g0[m], g0[m], -(2 * g0[m] + g1[m]), g0[m] + g1[m]], axis=1)
+        m = flat_then_rising
+        e = (g1[m] + 2 * g0[m]) / (g1[m] - g0[m])
+        eta[m] = e
+        lower[m, 1] = g0[m]
+        upper[m] = np.stack([g0[m] * e, g0[m], 0 * e, (g1[m] - g0[m]) / (3 * (1 - e) ** 2)], axis=1)
+        m = falling_then_flat
+        e = 3 * g1[m] / (g1[m] - g0[m])
+        eta[m] = e
+        lower[m] = np.stack([0 * e, g0[m], -(g0[m] - g1[m]) / e, (g0[m] - g1[m]) / (3 * e ** 2)], axis=1)
+        upper[m] = np.stack([g1[m] * e + (g0[m] - g1[m]) * e / 3, g1[m], 0 * e, 0 * e], axis=1)
+        m = same_sign
+        e = g1[m] / (g1[m] + g0[m])
+        a = -g0[m] * g1[m] / (g0[m] + g1[m])
+        eta[m] = e
+        lower[m] = np.stack([0 * e, g0[m], -(g0[m] - a) / e, (g0[m] - a) / (3 * e ** 2)], axis=1)
+        upper[m] = np.stack([a * e + (g0[m] - a) * e / 3, a, 0 * e, (g1[m] - a) / (3 * (1 - e) ** 2)], axis=1)
+    coefficients = np.stack([lower, upper], axis=1).reshape(-1, 4)
+    coefficients[~np.isfinite(coefficients)] = 0
+    return eta, coefficients
+
+
+class LogDiscountCurve:
+    """Interpolation on the log discount factors of a Curve of percent annually compounded rates.
+
+    'log_linear' and 'flat_forward' interpolate log discount factors linearly, which is the same as
+    holding the instantaneous forward flat between knots. 'monotone_convex' is the Hagan-West scheme:
+    continuous forwards that reprice every knot and stay monotone between them. Coefficients are
+    built once; evaluation is a single searchsorted over the piece breaks followed by a cubic per query.
+    Times beyond the last knot use the flat last forward.
+    """
+
+    def __init__(self, curve: Curve, method: str = "monotone_convex") -> None:
+        self._curve = self._is_valid_curve(curve)
+        self._method = check_interpolation(method)
+        t = np.asarray(curve.get_time, dtype=np.float64)
+        rt = np.asarray(curve.get_rate, dtype=np.float64)
+        if t.ndim != 1 or t.shape != rt.shape or t.shape[0] == 0:
+            raise ValueError("Curve time and rate must be 1-d arrays of the same length")
+        if t[0] == 0:
+            t, rt = t[1:], rt[1:]
+        if t.shape[0] == 0 or t[0] <= 0 or np.any(np.diff(t) <= 0):
+            raise ValueError("Curve times must be positive and strictly increasing")
+        knots = np.concatenate([[0.], t])
+        widths = np.diff(knots)
+        log_df = np.concatenate([[0.], -t * np.log1p(rt / 100)])
+        f_d = -np.diff(log_df) / widths
+        if self._method == "monotone_convex":
+            forwards = _node_forwards(knots, f_d)
+            eta, coefficients = _monotone_convex_coefficients(f_d, forwards)
+        else:
+            forwards = np.concatenate([f_d[:1], f_d])
+            eta, coefficients = np.full(f_d.shape[0], np.inf), np.zeros((2 * f_d.shape[0], 4))
+        self._f_start = forwards[0]
+        # Every interval splits at eta into two pieces on which log DF is a cubic in the time elapsed since
+        # the piece start, a last piece extrapolating the end forward flat
+        offset = np.stack([np.zeros_like(eta), np.clip(np.nan_to_num(eta, posinf=1), 0, 1)], axis=1).ravel()
+        width = np.repeat(widths, 2)
+        start = np.repeat(knots[:-1], 2) + offset * width
+        c0, c1, c2, c3 = coefficients.T
+        self._breaks = np.append(start, knots[-1])
+        self._poly = [np.append(np.repeat(log_df[:-1], 2) - np.repeat(f_d, 2) * offset * width - width * c0,
+                                log_df[-1]),
+                      np.append(-np.repeat(f_d, 2) - c1, -forwards[-1]),
+                      np.append(-c2 / width, 0),
+                      np.append(-c3 / width ** 2, 0)]
+
+    @staticmethod
+    def _is_valid_curve(attr: Any) -> Curve:
+        """Check if an attribute is an instance of Curve"""
+        assert (isinstance(attr, Curve)), "You need to Instance with a Curve"
+        return attr
+
+    def get_attr(self, attr: str) -> Any:
+        return self.__getattribute__(attr)
+
+    def _evaluate(self, t: np.ndarray, forward: bool = False) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Log discount factors of a flat time array and, if asked, the continuous instantaneous forwards
+        (decimal), locating every time with a single searchsorted over the piece breaks"""
+        if np.any(t < 0):
+            raise ValueError("Times must be positive")
+        j = np.searchsorted(self._breaks, t, side="right") - 1
+        s = t - self._breaks[j]
+        a0, a1, a2, a3 = (a[j] for a in self._poly)
+        log_df = ((a3 * s + a2) * s + a1) * s + a0
+        if not forward:
+            return log_df, None
+        return log_df, -((3 * a3 * s + 2 * a2) * s + a1)
+
+    def d_rate(self, t: Union[np.ndarray, Iterable, int, float]) -> Union[np.ndarray, Iterable, int, float]:
+        """Given a maturity return a d_rate"""
+        t = np.asarray(t, dtype=np.float64)
+        log_df = self._evaluate(t.ravel())[0].reshape(t.shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            continuous = np.where(t > 0, -log_df / t, self._f_start)
+        return 100 * np.expm1(continuous)
+
+    def df_t(self, t: Union[np.ndarray, Iterable, int, float]) -> Union[np.ndarray, Iterable, int, float]:
+        """Given a maturity return a discount factor"""
+        t = np.asarray(t, dtype=np.float64)
+        return np.exp(self._evaluate(t.ravel())[0]).reshape(t.shape)
+
+    def instantaneous_forward(self, t: Union[np.ndarray, Iterable, int, float]) -> Union[np.ndarray, Iterable, int, float]:
+        """Given a maturity return the continuously compounded instantaneous forward in percent"""
+        t = np.asarray(t, dtype=np.float64)
+        return 100 * self._evaluate(t.ravel(), forward=True)[1].reshape(t.shape)
+
+    def forward(self, t_1: Union[np.ndarray, Iterable, int, float],
+                t_2: Union[np.ndarray, Iterable, int, float]) -> Union[np.ndarray, Iterable, int, float]:
+        """Given two times return the forward d_rate between t_1/t_2"""
+        return ((self.d_rate(t_2) * t_2) - (self.d_rate(t_1) * t_1)) / (t_2 - t_1)
+
+    def create_curve(self, t_array: Union[np.ndarray, Iterable, int, float]) -> Curve:
+        """Given an array of time create a new curve"""
+        return Curve(t_array, self.d_rate(t_array))
@@ -0,0 +1,162 @@
+from collections import deque
+from typing import Any
+import time
+
+import numpy as np
+import scipy.optimize as sco
+
+from PyCurve.curve import Curve
+from PyCurve.loadings import as_time_array
+
+
+class OnlineCalibrator:
+    """Incremental recalibration of a parametric model from streaming single-tenor quotes.
+
+    The calibrator keeps the current quotes and solution. With fixed_taus the betas enter linearly,
+    so each quote moves them by one column of the pseudo-inverse of the cached loading matrix, and
+    betas leaving the model boundaries are re-solved by bounded least squares at the same taus.
+    Otherwise the solution is refined by a few warm-started Levenberg-Marquardt steps on the
+    closed-form Jacobian, the damping being carried over from one quote to the next.
+    The model starts from its current parameters, normally those of a full calibrate(curve).
+    """
+
+    def __init__(self, model: Any, curve: Curve, fixed_taus: bool = False, iterations: int = 3,
+                 history: int = 10000) -> None:
+        self._model = self._is_valid_model(model)
+        self._t = as_time_array(self._is_valid_curve(curve).get_time).copy()
+        self._rt = np.array(curve.get_rate, dtype=np.float64)
+        self._index = {tenor: i for i, tenor in enumerate(self._t.tolist())}
+        self._x = np.array([model.get_attr(attr) for attr in model.attr_list], dtype=np.float64)
+        self._low, self._high = np.array(model._boundaries, dtype=np.float64).T
+        self._damping = 1e-3
+        self._latencies: deque = deque(maxlen=history)
+        self.iterations: int = self._is_positive_int(iterations)
+        self.fixed_taus: bool = False
+        self.set_attr("fixed_taus", fixed_taus)
+
+    @staticmethod
+    def _is_valid_model(model: Any) -> Any:
+        """Check the model exposes the closed-form rates and Jacobian of the parametric models"""
+        if not hasattr(model, "_rate_and_jac"):
+            raise ValueError("model must be a NelsonSiegel, NelsonSiegelAugmented, BjorkChristensen or "
+                             "BjorkChristensenAugmented instance")
+        return model
+
+    @staticmethod
+    def _is_valid_curve(curve: Any) -> Curve:
+        """Check if an attribute is an instance of Curve"""
+        if not (isinstance(curve, Curve)):
+            raise ValueError("Curve parameter must be an instance of Curve")
+        return curve
+
+    @staticmethod
+    def _is_positive_int(attr: Any) -> int:
+        if not isinstance(attr, (int, np.integer)) or attr < 1:
+            raise ValueError("iterations must be a positive integer")
+        return int(attr)
+
+    def get_attr(self, attr: str) -> Any:
+        return self.__getattribute__(attr)
+
+    def set_attr(self, attr: str, x: Any) -> None:
+        if attr == "iterations":
+            x = self._is_positive_int(x)
+        self.__setattr__(attr, x)
+        if attr == "fixed_taus" and x:
+            self._build_projection()
+
+    @property
+    def get_time(self) -> np.ndarray:
+        return self._t
+
+    @property
+    def get_rate(self) -> np.ndarray:
+        """Latest quote of every tenor"""
+        return self._rt
+
+    @property
+    def get_params(self) -> np.ndarray:
+        return self._x.copy()
+
+    def _build_projection(self) -> None:
+        """Loading matrix at the current taus and its pseudo-inverse, betas re-solved on the current quotes"""
+        self._loading = self._model._loadings(self._t, *self._x[-self._model._n_taus:])
+        self._projection = np.linalg.pinv(self._loading)
+        betas = self._projection @ self._rt
+        self._commit(self._betas_within_bounds(betas, self._rt), self._rt, self._damping)
+        self._betas = betas
+
+    def _betas_within_bounds(self, betas: np.ndarray, rt: np.ndarray) -> np.ndarray:
+        """Current parameters with the least-squares betas, or, when those leave the model boundaries,
+        with the bounded least-squares betas of the quotes rt at the same taus"""
+        n_betas = self._loading.shape[1]
+        x = self._x.copy()
+        x[:n_betas] = betas
+        if not self._in_bounds(x):
+            x[:n_betas] = sco.lsq_linear(self._loading, rt, bounds=(self._low[:n_betas], self._high[:n_betas])).x
+        return x
+
+    def _in_bounds(self, x: np.ndarray) -> bool:
+        return bool(np.all((x >= self._low) & (x <= self._high)))
+
+    def _commit(self, x: np.ndarray, rt: np.ndarray, damping: float) -> None:
+        """Push a candidate to the model, then keep it: a rejected candidate leaves the state untouched"""
+        for attr, value in zip(self._model.attr_list, x):
+            self._model.set_attr(attr, value)
+        self._x, self._rt, self._damping = x, rt, damping
+
+    def _refine(self, x: np.ndarray, rt: np.ndarray) -> tuple:
+        """Warm-started Levenberg-Marquardt steps from x on the quotes rt, projected on the model
+        boundaries. Returns the refined parameters and the damping to carry over."""
+        damping = self._damping
+        rate, jac = self._model._rate_and_jac(x, self._t)
+        residual = rate - rt
+        sse = residual @ residual
+        for _ in range(self.iterations):
+            gram = jac @ jac.T
+            step = np.linalg.solve(gram + damping * np.diag(np.diag(gram) + 1e-12), jac @ residual)
+            candidate = np.clip(x - step, self._low, self._high)
+            new_rate, new_jac = self._model._rate_and_jac(candidate, self._t)
+            new_residual = new_rate - rt
+            new_sse = new_residual @ new_residual
+            if new_sse < sse:
+                x, jac, residual, sse = candidate, new_jac, new_residual, new_sse
+                damping = max(damping * 0.3, 1e-9)
+            else:
+                damping = min(damping * 10, 1e9)
+        return x, damping
+
+    def update(self, tenor: float, rate: float) -> np.ndarray:
+        """Record a new quote for one tenor of the grid and return the updated parameters.
+
+        With fixed_taus, a projected update leaving the model boundaries is re-solved by bounded
+        least squares on the betas, the taus staying fixed.
+        """
+        start = time.perf_counter()
+        i = self._index.get(float(tenor))
+        if i is None:
+            raise ValueError("tenor %s is not part of the calibrated grid" % tenor)
+        rt = self._rt.copy()
+        rt[i] = rate
+        if self.fixed_taus:
+            betas = self._betas + self._projection[:, i] * (rate - self._rt[i])
+            self._commit(self._betas_within_bounds(betas, rt), rt, self._damping)
+            self._betas = betas
+        else:
+            x, damping = self._refine(self._x, rt)
+            self._commit(x, rt, damping)
+        self._latencies.append(time.perf_counter() - start)
+        return self._x.copy()
+
+    def sse(self) -> float:
+        """Squared error sum of the current parameters against the latest quotes"""
+        residual = self._model._rate_and_jac(self._x, self._t)[0] - self._rt
+        return float(residual @ residual)
+
+    def latency_info(self) -> dict:
+        """Update latency statistics in seconds over the recorded history"""
+        latencies = np.fromiter(self._latencies, dtype=np.float64, count=len(self._latencies))
+        if latencies.size == 0:
+            return {"count": 0, "last": np.nan, "mean": np.nan, "p99": np.nan, "max": np.nan}
+        return {"count": latencies.size, "last": latencies[-1], "mean": latencies.mean(),
+                "p99": np.quantile(latencies, 0.99), "max": latencies.max()}
@@ -0,0 +1,141 @@
+from typing import Any, Iterable, Optional, Union
+
+import numpy as np
+from PyCurve.actuarial_implementation import continuous_df, discrete_df
+from PyCurve.loadings import check_precision
+from PyCurve.store import MODELS, CurveStore
+
+
+class CurvePanel:
+    """Parameters of one parametric model over many dates, evaluated for all dates x tenors at once.
+
+    params is a (dates x parameters) array in the model attr_list order, or the records returned by
+    calibrate_panel / calibrate_parallel. Betas and taus are held as two 2-d arrays; an evaluation
+    broadcasts the tenors against the tau columns to build the (dates x tenors x factors) loadings and
+    contracts them with the betas in one batched product, without creating a model per date.
+    Rates come back as (dates x tenors) arrays, or (dates,) for a scalar time.
+    """
+
+    def __init__(self, model: Any, params: Union[np.ndarray, list], dates: Optional[Iterable] = None,
+                 precision: str = "float64") -> None:
+        self._model = self._is_valid_model(model)
+        if isinstance(params, np.ndarray) and params.dtype.names is not None:
+            params = params["x"]
+        params = np.asarray(params, dtype=np.float64)
+        if params.ndim != 2 or params.shape[1] != self._model._x0.shape[0]:
+            raise ValueError("params must be a (dates x %d) array" % self._model._x0.shape[0])
+        n_taus = self._model._n_taus
+        self._betas = params[:, :-n_taus]
+        self._taus = params[:, -n_taus:]
+        self._dates = None if dates is None else self._is_valid_dates(dates, params.shape[0])
+        self.precision: str = check_precision(precision)
+
+    @classmethod
+    def _from_views(cls, model: type, betas: np.ndarray, taus: np.ndarray, dates: Optional[np.ndarray],
+                    precision: str) -> "CurvePanel":
+        """Wrap already validated arrays without copying them"""
+        panel = cls.__new__(cls)
+        panel._model, panel._betas, panel._taus, panel._dates = model, betas, taus, dates
+        panel.precision = precision
+        return panel
+
+    @classmethod
+    def from_store(cls, store: CurveStore, start: Any = None, end: Any = None,
+                   precision: str = "float64") -> "CurvePanel":
+        """Panel of the parameters kept in a model CurveStore between two dates"""
+        if store.kind != "model":
+            raise TypeError("from_store needs a model store")
+        dates, params = store.panel(start, end)
+        return cls(store.model_type, params, dates, precision)
+
+    @staticmethod
+    def _is_valid_model(model: Any) -> type:
+        """Model class of a parametric model class or instance"""
+        model = model if isinstance(model, type) else type(model)
+        if model not in MODELS.values():
+            raise ValueError("model must be NelsonSiegel, NelsonSiegelAugmented, BjorkChristensen or "
+                             "BjorkChristensenAugmented")
+        return model
+
+    @staticmethod
+    def _is_valid_dates(dates: Iterable, n_dates: int) -> np.ndarray:
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        if dates.shape != (n_dates,):
+            raise ValueError("one date per row of params is required")
+        if np.any(dates[1:] <= dates[:-1]):
+            raise ValueError("dates must be strictly increasing")
+        return dates
+
+    def get_attr(self, attr: str) -> Any:
+        return self.__getattribute__(attr)
+
+    def set_attr(self, attr: str, x: Any) -> None:
+        if attr == "precision":
+            x = check_precision(x)
+        self.__setattr__(attr, x)
+
+    def __len__(self) -> int:
+        return self._betas.shape[0]
+
+    def __repr__(self) -> str:
+        return "CurvePanel(%s, %d dates)" % (self._model.__name__, len(self))
+
+    @property
+    def dates(self) -> Optional[np.ndarray]:
+        return self._dates
+
+    @property
+    def get_params(self) -> np.ndarray:
+        """(dates x parameters) array in the model attr_list order"""
+        return np.concatenate([self._betas, self._taus], axis=1)
+
+    def __getitem__(self, key: Any) -> "CurvePanel":
+        """Sub-panel of dates by position: views for slices, copies for index arrays and masks"""
+        if isinstance(key, (int, np.integer)):
+            key = slice(key, key + 1 if key != -1 else None)
+        dates = None if self._dates is None else self._dates[key]
+        return self._from_views(self._model, self._betas[key], self._taus[key], dates, self.precision)
+
+    def between(self, start: Any = None, end: Any = None) -> "CurvePanel":
+        """Sub-panel of the dates in [start, end], both bounds optional, sharing the parameter arrays"""
+        if self._dates is None:
+            raise ValueError("the panel has no dates")
+        first = 0 if start is None else np.searchsorted(self._dates, np.datetime64(start, "D"), side="left")
+        last = len(self) if end is None else np.searchsorted(self._dates, np.datetime64(end, "D"), side="right")
+        return self[int(first):int(last)]
+
+    def model(self, i: int) -> Any:
+        """Model instance of a single date"""
+        return self._model(*self._betas[i].tolist(), *self._taus[i].tolist(), precision=self.precision)
+
+    def _evaluate(self, loadings: Any, t: Any) -> np.ndarray:
+        """Contract the loadings of every date with its betas"""
+        t = np.asarray(t)
+        taus = [self._taus[:, [j]].reshape((-1,) + (1,) * t.ndim) for j in range(self._taus.shape[1])]
+        matrix = loadings(t, *taus, self.precision)
+        n_dates, n_factors = self._betas.shape
+        flat = matrix.reshape(n_dates, -1, n_factors)
+        betas = self._betas.astype(flat.dtype, copy=False)[:, :, None]
+        return np.matmul(flat, betas).reshape((n_dates,) + t.shape)
+
+    def d_rate(self, t: Union[np.ndarray, Iterable, int, float]) -> np.ndarray:
+        """(dates x tenors) rates"""
+        return self._evaluate(self._model._loadings, t)
+
+    def df_t(self, t: Union[np.ndarray, Iterable, int, float]) -> np.ndarray:
+        """(dates x tenors) discount factors"""
+        return discrete_df(self.d_rate(t), np.asarray(t), overwrite=True)
+
+    def cdf_t(self, t: Union[np.ndarray, Iterable, int, float]) -> np.ndarray:
+        """(dates x tenors) continuous discount factors"""
+        return continuous_df(self.d_rate(t), np.asarray(t), overwrite=True)
+
+    def forward_rate(self, t_1: Union[np.ndarray, Iterable, int, float],
+                     t_2: Union[np.ndarray, Iterable, int, float]) -> np.ndarray:
+        """(dates x tenors) forward d_rate between t_1 and t_2"""
+        t_1, t_2 = np.broadcast_arrays(np.asarray(t_1, dtype=np.float64), np.asarray(t_2, dtype=np.float64))
+        return ((self.d_rate(t_2) * t_2) - (self.d_rate(t_1) * t_1)) / (t_2 - t_1)
+
+    def instantaneous_forward(self, t: Union[np.ndarray, Iterable, int, float]) -> np.ndarray:
+        """(dates x tenors) closed-form instantaneous forwards"""
+        return self._evaluate(self._model._forward_loadings, t)
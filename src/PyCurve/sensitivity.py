@@ -0,0 +1,114 @@
+from typing import Any, Optional, Union
+
+import numpy as np
+import scipy.sparse as sp
+from PyCurve.actuarial_implementation import continuous_df, discrete_df
+from PyCurve.calibration import COMPOUNDINGS
+from PyCurve.loadings import as_time_array
+
+
+def parallel_bump(t: (np.ndarray, list), size: float = 0.01) -> np.ndarray:
+    """(1 x times) shift of size (percent, 0.01 = 1bp) on every time"""
+    return np.full((1, len(t)), size, dtype=np.float64)
+
+
+def key_rate_bumps(t: (np.ndarray, list), keys: (np.ndarray, list), size: float = 0.01) -> np.ndarray:
+    """(keys x times) triangular shifts peaking at each key rate, flat beyond the first and last keys so
+    that the rows add up to a parallel shift"""
+    t = as_time_array(t)
+    keys = as_time_array(keys)
+    if keys.ndim != 1 or np.any(np.diff(keys) <= 0):
+        raise ValueError("keys must be strictly increasing")
+    bumps = np.zeros((keys.shape[0], t.shape[0]))
+    if keys.shape[0] == 1:
+        bumps[0] = size
+        return bumps
+    right = np.clip(np.searchsorted(keys, t), 1, keys.shape[0] - 1)
+    weight = np.clip((t - keys[right - 1]) / (keys[right] - keys[right - 1]), 0, 1)
+    columns = np.arange(t.shape[0])
+    bumps[right - 1, columns] = size * (1 - weight)
+    bumps[right, columns] += size * weight
+    return bumps
+
+
+def twist_bump(t: (np.ndarray, list), short: float, long: float, size: float = 0.01) -> np.ndarray:
+    """(1 x times) steepener moving rates by -size / 2 up to short and +size / 2 from long, linear in between"""
+    t = as_time_array(t)
+    if long <= short:
+        raise ValueError("long must be greater than short")
+    return (size * (np.clip((t - short) / (long - short), 0, 1) - 0.5))[None, :]
+
+
+class SensitivityEngine:
+    """Bump-and-reprice of cash flows on a fixed grid of payment times.
+
+    The base zero rates of the model (anything exposing d_rate, from LinearCurve to the parametric
+    models) are evaluated once on the payment times. A stack of bumps, a (bumps x times) array of rate
+    shifts in percent, then gives every bumped discount factor in one array operation, and present
+    values of a (instruments x times) cash-flow matrix in one matrix product.
+    """
+
+    def __init__(self, model: Any, t: (np.ndarray, list), compounding: str = "discrete") -> None:
+        self._model = self._is_valid_model(model)
+        self._t = as_time_array(t)
+        self._compounding = self._is_valid_compounding(compounding)
+        self._rates = np.asarray(model.d_rate(self._t), dtype=np.float64)
+        self._df = self.discount_factors()[0]
+
+    @staticmethod
+    def _is_valid_model(model: Any) -> Any:
+        if not hasattr(model, "d_rate"):
+            raise ValueError("model must expose d_rate(t)")
+        return model
+
+    @staticmethod
+    def _is_valid_compounding(compounding: Any) -> str:
+        if compounding in COMPOUNDINGS:
+            return compounding
+        else:
+            raise TypeError("compounding must be 'discrete' or 'continuous'")
+
+    def get_attr(self, attr: str) -> Any:
+        return self.__getattribute__(attr)
+
+    def discount_factors(self, shifts: Optional[np.ndarray] = None) -> np.ndarray:
+        """(bumps x times) discount factors of the base rates moved by every row of shifts"""
+        rates = self._rates[None, :] if shifts is None else self._rates + np.atleast_2d(shifts)
+        if self._compounding == "discrete":
+            return discrete_df(rates, self._t, overwrite=shifts is not None)
+        return continuous_df(rates, self._t, overwrite=shifts is not None)
+
+    def _cashflows(self, cashflows: Any) -> Any:
+        if not sp.issparse(cashflows):
+            cashflows = np.asarray(cashflows, dtype=np.float64)
+        if cashflows.shape[-1] != self._t.shape[0]:
+            raise ValueError("cashflows must have one column per payment time")
+        return cashflows
+
+    def present_value(self, cashflows: Any, shifts: Optional[np.ndarray] = None) -> np.ndarray:
+        """Present values, (instruments x bumps) when shifts are given, (instruments,) otherwise"""
+        cashflows = self._cashflows(cashflows)
+        if shifts is None:
+            return cashflows @ self._df
+        return cashflows @ self.discount_factors(shifts).T
+
+    def bump_dv01(self, cashflows: Any, bumps: np.ndarray, size: float = 0.01) -> np.ndarray:
+        """Value lost per bump by central differences, (instruments x bumps), rescaled from bumps of the
+        given size to 1bp"""
+        bumps = np.atleast_2d(bumps)
+        pv = self.present_value(cashflows, np.concatenate([bumps, -bumps]))
+        n_bumps = bumps.shape[0]
+        return (pv[..., n_bumps:] - pv[..., :n_bumps]) / 2 * (0.01 / size)
+
+    def dv01(self, cashflows: Any, size: float = 0.01) -> Union[np.ndarray, float]:
+        """Value lost by a 1bp parallel rise of the zero curve"""
+        return self.bump_dv01(cashflows, parallel_bump(self._t, size), size)[..., 0]
+
+    def key_rate_dv01(self, cashflows: Any, keys: (np.ndarray, list), size: float = 0.01) -> np.ndarray:
+        """(instruments x keys) value lost by a 1bp rise of each key rate, the columns adding up to dv01"""
+        return self.bump_dv01(cashflows, key_rate_bumps(self._t, keys, size), size)
+
+    def key_rate_durations(self, cashflows: Any, keys: (np.ndarray, list), size: float = 0.01) -> np.ndarray:
+        """Key-rate durations: key rate DV01 over present value per unit (1e-4) of rate"""
+        pv = self.present_value(cashflows)
+        return self.key_rate_dv01(cashflows, keys, size) / (np.asarray(pv)[..., None] * 1e-4)
@@ -1,15 +1,184 @@
-from typing import Any
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Iterable, Iterator, Optional, Union
+from PyCurve.actuarial_implementation import df_to_rate
 from PyCurve.curve import Curve
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.special import ndtri
+from scipy.stats import qmc
 
 
+def _yield_curve(mean_discount: np.ndarray, t: np.ndarray) -> Curve:
+    """Curve of the annually compounded decimal yields of mean discount factors"""
+    return Curve(t, df_to_rate(mean_discount, t, "annual", "decimal"))
+
+
+SCHEMES = ("euler", "exact")
+
+
+def check_scheme(scheme: Any) -> str:
+    if scheme in SCHEMES:
+        return scheme
+    else:
+        raise TypeError("scheme must be 'euler' or 'exact'")
+
+
+def chunk_sizes(n: int, chunk_size: int) -> list:
+    """Sizes of the consecutive chunks splitting n paths, all of chunk_size but the last"""
+    if not isinstance(n, (int, np.integer)) or not isinstance(chunk_size, (int, np.integer)) \
+            or n < 1 or chunk_size < 1:
+        raise ValueError("n and chunk_size must be positive integers")
+    return [chunk_size] * (n // chunk_size) + ([n % chunk_size] if n % chunk_size else [])
+
+
+SAMPLINGS = ("plain", "antithetic", "sobol")
+
+
+def check_sampling(sampling: Any) -> str:
+    if sampling in SAMPLINGS:
+        return sampling
+    else:
+        raise TypeError("sampling must be 'plain', 'antithetic' or 'sobol'")
+
+
+def _brownian_bridge(normals: np.ndarray) -> np.ndarray:
+    """Unit variance Brownian increments over the rows of a (steps x n) array of normals, in place.
+
+    Row 0 sets the endpoint of the path and the following rows fill the midpoints level by level, so
+    the leading (best distributed) Sobol coordinates drive the large scale moves of the path.
+    """
+    steps = normals.shape[0]
+    path = np.empty((steps + 1, normals.shape[1]))
+    path[0] = 0.
+    path[steps] = np.sqrt(steps) * normals[0]
+    intervals, k = deque([(0, steps)]), 1
+    while intervals:
+        left, right = intervals.popleft()
+        if right - left < 2:
+            continue
+        middle = (left + right) // 2
+        path[middle] = ((right - middle) * path[left] + (middle - left) * path[right]) / (right - left)
+        path[middle] += np.sqrt((middle - left) * (right - middle) / (right - left)) * normals[k]
+        intervals.extend([(left, middle), (middle, right)])
+        k += 1
+    return np.subtract(path[1:], path[:-1], out=normals)
+
+
+def standard_normals(steps: int, n: int, sampling: str = "plain", factors: int = 1,
+                     rng: Optional[np.random.Generator] = None) -> list:
+    """factors arrays of (steps x n) standard normal shocks drawn from rng, a fresh generator by default.
+
+    plain draws independent normals, antithetic draws n / 2 of them and appends their negatives and
+    sobol maps one scrambled Sobol point of dimension factors * steps per path through the inverse
+    normal cdf, the first factor being built with a Brownian bridge. The points are the first n of
+    the next power of two drawn, so any n works, but only a power of two n keeps the balance
+    properties of the Sobol sequence.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    if check_sampling(sampling) == "plain":
+        return [rng.standard_normal((steps, n)) for _ in range(factors)]
+    if sampling == "antithetic":
+        if n % 2:
+            raise ValueError("antithetic sampling needs an even number of paths")
+        shocks = [rng.standard_normal((steps, n // 2)) for _ in range(factors)]
+        return [np.concatenate([shock, -shock], axis=1) for shock in shocks]
+    if factors * steps > qmc.Sobol.MAXDIM:
+        raise ValueError("sobol sampling supports at most %d dimensions" % qmc.Sobol.MAXDIM)
+    sobol = qmc.Sobol(factors * steps, scramble=True, seed=rng)
+    points = sobol.random_base2(int(n - 1).bit_length())[:n]
+    shocks = [ndtri(np.ascontiguousarray(points[:, j * steps:(j + 1) * steps].T)) for j in range(factors)]
+    shocks[0] = _brownian_bridge(shocks[0])
+    return shocks
+
+
+def sampling_chunk_sizes(n: int, chunk_size: int, sampling: str) -> list:
+    """chunk_sizes of n paths checked against the sampling before anything is simulated: antithetic
+    pairs need every chunk, so n and chunk_size, to be even"""
+    sizes = chunk_sizes(n, chunk_size)
+    if check_sampling(sampling) == "antithetic" and any(size % 2 for size in sizes):
+        raise ValueError("antithetic sampling needs an even n and an even chunk_size")
+    return sizes
+
+
+def _ou_integral_moments(alpha: float, sigma: float, h: Any) -> tuple:
+    """Mean factor (1 - e^-alpha h) / alpha and variance of the integral of an OU process over h"""
+    mean_factor = -np.expm1(-alpha * h) / alpha
+    variance = sigma ** 2 / alpha ** 2 * (h - 2 * mean_factor - np.expm1(-2 * alpha * h) / (2 * alpha))
+    return mean_factor, variance
+
+
+def ou_transition(alpha: float, sigma: float, h: float) -> dict:
+    """Exact one-step law of dx = -alpha x dt + sigma dW and of its integral over a step of length h.
+
+    Given x(t), x(t + h) = decay x(t) + sd Z1 and the integral of x over the step is
+    mean_factor x(t) + slope (x(t + h) - decay x(t)) + residual_sd Z2, with Z1, Z2 independent normals.
+    """
+    if alpha <= 0:
+        raise ValueError("exact transitions need a positive mean reversion speed alpha")
+    decay = np.exp(-alpha * h)
+    mean_factor, integral_variance = _ou_integral_moments(alpha, sigma, h)
+    variance = sigma ** 2 * -np.expm1(-2 * alpha * h) / (2 * alpha)
+    covariance = sigma ** 2 / (2 * alpha ** 2) * np.expm1(-alpha * h) ** 2
+    slope = covariance / variance if variance > 0 else 0.
+    return {"decay": decay, "sd": np.sqrt(variance), "mean_factor": mean_factor, "slope": slope,
+            "residual_sd": np.sqrt(max(integral_variance - slope * covariance, 0.)),
+            "integral_variance": integral_variance}
+
+
+def ou_zero_coupon(x0: float, phi_integral: np.ndarray, alpha: float, sigma: float, dt: float) -> np.ndarray:
+    """Analytic zero-coupon prices E[exp(-integral of r)] of r = x + phi at the grid times dt, 2 dt, ...
+
+    P(0, T) = exp(-integral of phi - x0 B(T) + V(T) / 2) with B(T) and V(T) the mean factor and the
+    variance of the integral of x over [0, T].
+    """
+    if alpha <= 0:
+        raise ValueError("zero-coupon prices need a positive mean reversion speed alpha")
+    t = np.arange(1, phi_integral.shape[0] + 1) * dt
+    mean_factor, variance = _ou_integral_moments(alpha, sigma, t)
+    return np.exp(-np.cumsum(phi_integral) - x0 * mean_factor + variance / 2)
+
+
+def exact_paths(x0: float, phi: np.ndarray, phi_integral: np.ndarray, alpha: float, sigma: float, dt: float,
+                n: int, sampling: str = "plain", control_variate: bool = False,
+                rng: Optional[np.random.Generator] = None) -> "Simulation":
+    """Paths of r = x + phi sampled exactly on the grid i * dt, x an Ornstein-Uhlenbeck process started at x0.
+
+    phi holds the deterministic shift at every grid time and phi_integral its integral over every step;
+    the integrated rate of every step is sampled jointly with the rate, so the discount factors carry no
+    discretization bias whatever the step. With control_variate=True the Simulation carries the
+    one-step zero-coupon price P(t, t + dt) = exp(intercept - B r(t)) used as a control, see
+    Simulation.control_variate.
+    """
+    law = ou_transition(alpha, sigma, dt)
+    steps = phi.shape[0]
+    shocks, residuals = standard_normals(steps, n, sampling, factors=2, rng=rng)
+    simulation = np.empty((steps, n))
+    integrated = np.empty((steps, n))
+    x = np.full(n, float(x0))
+    for i in range(steps):
+        simulation[i] = x + phi[i]
+        shock = law["sd"] * shocks[i]
+        integrated[i] = (law["mean_factor"] * x + law["slope"] * shock
+                         + law["residual_sd"] * residuals[i] + phi_integral[i])
+        x = law["decay"] * x + shock
+    control = None
+    if control_variate:
+        intercept = law["mean_factor"] * phi - phi_integral + law["integral_variance"] / 2
+        control = (intercept, law["mean_factor"], ou_zero_coupon(x0, phi_integral, alpha, sigma, dt))
+    return Simulation(simulation, dt, integrated, sampling, control)
 
 
 class Simulation:
-    def __init__(self, simulated_paths: np.ndarray, dt: float) -> None:
+    def __init__(self, simulated_paths: np.ndarray, dt: float, integrated: Optional[np.ndarray] = None,
+                 sampling: str = "plain", control: Optional[tuple] = None) -> None:
         self._sim = self._is_valid_attr(simulated_paths)
         self._dt = dt
+        self._integrated = None if integrated is None else self._is_valid_integrated(integrated, self._sim)
+        self._sampling = check_sampling(sampling)
+        self._control = control
+        self._mean_discount = None
 
     @property
     def get_sim(self) -> np.ndarray:
@@ -32,34 +201,116 @@ class Simulation:
         assert isinstance(attr, np.ndarray), "Class Constructor takes only numpy arrays or list as arguments"
         return attr
 
+    @staticmethod
+    def _is_valid_integrated(integrated: Any, sim: np.ndarray) -> np.ndarray:
+        if not isinstance(integrated, np.ndarray) or integrated.shape != sim.shape:
+            raise ValueError("integrated must be an array shaped like the simulated paths")
+        return integrated
+
+    @property
+    def get_integrated(self) -> Optional[np.ndarray]:
+        """Integral of the rate over every step when sampled exactly, None for Euler paths"""
+        return self._integrated
+
+    @property
+    def get_sampling(self) -> str:
+        return self._sampling
+
+    @property
+    def get_time(self) -> np.ndarray:
+        """Time of every simulated step, dt, 2 dt, ..."""
+        return np.arange(1, self.get_steps + 1) * self.get_dt
+
+    @property
+    def get_control_mean(self) -> Optional[np.ndarray]:
+        """Known mean of the control variate of every step, the analytic zero-coupon price of its time"""
+        return None if self._control is None else self._control[2]
+
+    def control_variate(self, discount_factor: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Pathwise control D(t) P(t, t + dt) of every step, None for paths simulated without one.
+
+        D(t) is the pathwise discount factor up to the start of the step and P(t, t + dt) the analytic
+        price of a zero-coupon bond paying at its end given the simulated rate. The discounted bond
+        price is a martingale, so the control has mean P(0, t + dt) and moves with the discount factor
+        of the step up to the noise of a single step. discount_factor reuses an already computed
+        discount_factor().
+        """
+        if self._control is None:
+            return None
+        intercept, slope, _ = self._control
+        control = np.multiply(self.get_sim, -slope)
+        control += intercept[:, None]
+        np.exp(control, out=control)
+        discount = self.discount_factor() if discount_factor is None else discount_factor
+        control[1:] *= discount[:-1]
+        return control
+
+    def aggregate(self) -> "SimulationAggregate":
+        """Per-step statistics of the paths, with standard errors and control variate estimates"""
+        return SimulationAggregate.from_chunks([self])
+
+    def discount_standard_error(self) -> np.ndarray:
+        """Standard error of the estimated discount factor of every step, see SimulationAggregate"""
+        return self.aggregate().discount_standard_error()
+
+    def _step_integrals(self) -> tuple:
+        """Integral of the rate over every step, or the rates with the dt scaling of the Riemann sum"""
+        if self._integrated is not None:
+            return self._integrated, 1.
+        return self.get_sim, self.get_dt
+
     def yield_curve(self) -> Curve:
-        discount_factor: np.ndarray = self.discount_factor()
-        yield_curve = (np.mean(discount_factor, axis=1) ** (-1 / np.full(self.get_steps, self.get_dt).cumsum())) - 1
-        return Curve(np.full(self.get_steps, self.get_dt).cumsum(), yield_curve)
-
-    def discount_factor(self) -> np.array:
-        rieman_sum: np.ndarray = np.zeros(shape=self.get_sim.shape)
-        discount_factor: np.ndarray = np.zeros(shape=self.get_sim.shape)
-        for sim in range(self.get_nb_sim):
-            rieman_sum[:, sim] = np.cumsum(np.multiply(self.get_sim[:, sim], self.get_dt))
-            discount_factor[:, sim] = np.exp(-rieman_sum[:, sim])
-        return discount_factor
+        """Annually compounded yields implied by the mean discount factor of every step, control variate
+        adjusted when the paths carry one"""
+        if self._control is not None:
+            return self.aggregate().yield_curve()
+        return _yield_curve(self.discount_factor(average=True), self.get_time)
+
+    def discount_factor(self, average: bool = False, block_size: int = 2 ** 18) -> np.ndarray:
+        """Pathwise discount factors exp(-dt * cumulative sum of rates), or of the exactly sampled step
+        integrals when available, (steps x paths), in a single buffer.
+
+        With average=True only the mean over paths of every step is returned: the running sum goes
+        through blocks of about block_size elements, so the (steps x paths) matrix is never
+        materialized. The mean is cached, the simulated paths being fixed.
+        """
+        integrals, scale = self._step_integrals()
+        if not average:
+            discount_factor = np.cumsum(integrals, axis=0, dtype=np.float64)
+            discount_factor *= -scale
+            return np.exp(discount_factor, out=discount_factor)
+        if self._mean_discount is None:
+            n_rows = max(1, block_size // max(self.get_nb_sim, 1))
+            block = np.empty((min(n_rows, self.get_steps), self.get_nb_sim))
+            carry = np.zeros(self.get_nb_sim)
+            mean = np.empty(self.get_steps)
+            for start in range(0, self.get_steps, n_rows):
+                rows = block[:min(n_rows, self.get_steps - start)]
+                np.cumsum(integrals[start:start + rows.shape[0]], axis=0, out=rows)
+                rows += carry
+                carry[:] = rows[-1]
+                rows *= -scale
+                np.exp(rows, out=rows)
+                np.mean(rows, axis=1, out=mean[start:start + rows.shape[0]])
+            self._mean_discount = mean
+            self._mean_discount.setflags(write=False)
+        return self._mean_discount
 
     def plot_discount_curve(self, average: bool = False) -> None:
-        discount_factor: np.ndarray = self.discount_factor()
-        t: np.ndarray = np.full(self.get_steps, self.get_dt).cumsum()
+        discount_factor: np.ndarray = self.discount_factor(average=average)
+        t: np.ndarray = self.get_time
         fig, ax = plt.subplots(1)
         fig.canvas.set_window_title('Discount Factor')
         fig.suptitle("Discount Factor")
         ax.set_xlabel('Time, t')
         ax.set_ylabel('Simulated Discount Factor')
         if average:
-            ax.plot(t, np.mean(discount_factor, axis=1), c="navy")
+            ax.plot(t, discount_factor, c="navy")
         else:
             ax.plot(t, discount_factor)
 
     def plot_simulation(self) -> None:
-        t: np.ndarray = np.full(self.get_steps, self.get_dt).cumsum()
+        t: np.ndarray = self.get_time
         fig, ax = plt.subplots(1)
         fig.suptitle("Simulated Paths")
         fig.canvas.set_window_title('Simulated Paths')
@@ -70,7 +321,7 @@ class Simulation:
         return fig
 
     def plot_yield_curve(self) -> None:
-        t: np.ndarray = np.full(self.get_steps, self.get_dt).cumsum()
+        t: np.ndarray = self.get_time
         curve: Curve = self.yield_curve()
         fig, ax = plt.subplots(1)
         fig.suptitle("Simulated Yield Curve")
@@ -84,7 +335,7 @@ class Simulation:
         return fig
 
     def plot_model(self) -> None:
-        t: np.ndarray = np.full(self.get_steps, self.get_dt).cumsum()
+        t: np.ndarray = self.get_time
         curve: Curve = self.yield_curve()
         fig = plt.figure(figsize=(12.5, 8))
         fig.suptitle("Simulated Model")
@@ -96,10 +347,301 @@ class Simulation:
         ax2 = fig.add_subplot(221)
         ax2.set_xlabel('Time, t')
         ax2.set_ylabel('Discount factor')
-        ax2.plot(t, np.mean(self.discount_factor(), axis=1), lw=2, c="navy")
+        ax2.plot(t, self.discount_factor(average=True), lw=2, c="navy")
         ax3 = fig.add_subplot(222)
         ax3.set_xlabel('Time, t')
         ax3.set_ylabel('Yield')
         ax3.plot(curve.get_time, curve.get_rate, lw=2, c="darkred")
         plt.show()
         return fig
+
+
+def _simulate_chunk(model: Any, options: dict, stream: bool, task: tuple) -> Any:
+    """Simulation of one chunk of paths from its own seed, or its aggregate, run in a worker process"""
+    size, seed = task
+    simulation = model.simulate_paths(size, rng=np.random.default_rng(seed), **options)
+    return SimulationAggregate.from_chunks([simulation]) if stream else simulation
+
+
+def _concatenate(simulations: list) -> "Simulation":
+    """One Simulation of chunks of the same paths grid, antithetic halves kept facing each other"""
+    first = simulations[0]
+    if first.get_sampling == "antithetic":
+        halves = [(s, slice(0, s.get_nb_sim // 2)) for s in simulations] + \
+                 [(s, slice(s.get_nb_sim // 2, None)) for s in simulations]
+    else:
+        halves = [(s, slice(None)) for s in simulations]
+    paths = np.concatenate([s.get_sim[:, part] for s, part in halves], axis=1)
+    integrated = None if first.get_integrated is None else \
+        np.concatenate([s.get_integrated[:, part] for s, part in halves], axis=1)
+    return Simulation(paths, first.get_dt, integrated, first.get_sampling, first._control)
+
+
+def simulate_parallel(model: Any, n: int, chunk_size: int = 1000, workers: Optional[int] = None,
+                      stream: bool = False, seed: Any = None, **options: Any) -> Any:
+    """n paths of a Vasicek or HullWhite model simulated chunk by chunk in a pool of worker processes.
+
+    Chunk i draws from the i-th SeedSequence of model.spawn_seeds(n_chunks, seed), which does not depend on
+    the worker that runs it, and results are merged in chunk order, so for a given seed and chunk_size
+    the output is bit-identical whatever the number of workers (workers=1 runs in process), and equal
+    to simulate_chunks / simulate_stream. Returns one Simulation, or with stream=True a
+    SimulationAggregate merged from per-chunk aggregates, so only statistics travel between processes.
+    A merged Sobol Simulation is a single replicate, stream keeps every chunk as one.
+    """
+    sizes = sampling_chunk_sizes(n, chunk_size, options.get("sampling", "plain"))
+    tasks = list(zip(sizes, model.spawn_seeds(len(sizes), seed)))
+    task = partial(_simulate_chunk, model, options, stream)
+    if workers == 1:
+        results = list(map(task, tasks))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(task, tasks))
+    if not stream:
+        return _concatenate(results)
+    aggregate = results[0]
+    for result in results[1:]:
+        aggregate.merge(result)
+    return aggregate
+
+
+def _merge_moments(n: int, mean: np.ndarray, comoment: np.ndarray, n_other: int, other_mean: np.ndarray,
+                   other_comoment: np.ndarray) -> None:
+    """Pairwise update of Chan et al., in place, of the (k x steps) means and (k x k x steps) co-moments of
+    n samples with those of n_other other samples"""
+    total = n + n_other
+    if n_other == 0:
+        return
+    delta = other_mean - mean
+    comoment += other_comoment + delta[:, None] * delta[None, :] * (n * n_other / total)
+    mean += delta * (n_other / total)
+
+
+def _sample_units(matrix: np.ndarray, sampling: str) -> np.ndarray:
+    """Independent samples of a (steps x paths) array: the paths, the antithetic pair means or the mean
+    of a Sobol chunk, which is one randomized replicate"""
+    if sampling == "antithetic":
+        half = matrix.shape[1] // 2
+        return (matrix[:, :half] + matrix[:, half:]) / 2
+    if sampling == "sobol":
+        return matrix.mean(axis=1, keepdims=True)
+    return matrix
+
+
+class SimulationAggregate:
+    """Running per-step statistics of simulated paths accumulated chunk by chunk.
+
+    Every chunk (a Simulation) adds its path count, per-step means and sums of squared deviations of
+    the rates, and the same statistics of the discount factors over independent samples: paths for
+    plain sampling, antithetic pairs, or whole chunks for Sobol sampling, every scrambled chunk being
+    one randomized quasi Monte Carlo replicate. Chunks carrying a control variate also add its mean
+    and co-moments with the discount factor. Statistics are merged with the pairwise update of Chan
+    et al., so memory depends on the number of steps only. Aggregates of disjoint path sets merge the
+    same way.
+    """
+
+    def __init__(self, steps: int, dt: float) -> None:
+        self._steps = steps
+        self._dt = dt
+        self._n = 0
+        self._rate_mean = np.zeros(steps)
+        self._rate_m2 = np.zeros(steps)
+        self._n_samples = 0
+        self._sampling: Optional[str] = None
+        self._control_mean: Optional[np.ndarray] = None
+        self._sample_mean: Optional[np.ndarray] = None
+        self._sample_comoment: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Simulation]) -> "SimulationAggregate":
+        """Aggregate of a stream of Simulation chunks, consumed one at a time"""
+        aggregate: Optional[SimulationAggregate] = None
+        for chunk in chunks:
+            if aggregate is None:
+                aggregate = cls(chunk.get_steps, chunk.get_dt)
+            aggregate.update(chunk)
+        if aggregate is None:
+            raise ValueError("at least one chunk is required")
+        return aggregate
+
+    def get_attr(self, attr: str) -> Any:
+        return self.__getattribute__(attr)
+
+    @property
+    def get_nb_sim(self) -> int:
+        return self._n
+
+    @property
+    def get_nb_samples(self) -> int:
+        """Number of independent samples: paths, antithetic pairs or Sobol replicates"""
+        return self._n_samples
+
+    @property
+    def get_steps(self) -> int:
+        return self._steps
+
+    @property
+    def get_dt(self) -> float:
+        return self._dt
+
+    @property
+    def get_time(self) -> np.ndarray:
+        """Time of every simulated step, dt, 2 dt, ..."""
+        return np.arange(1, self._steps + 1) * self._dt
+
+    def _combine(self, n: int, rate_mean: np.ndarray, rate_m2: np.ndarray, n_samples: int, sampling: str,
+                 control_mean: Optional[np.ndarray], sample_mean: np.ndarray, sample_comoment: np.ndarray) -> None:
+        if self._sampling is None:
+            self._sampling, self._control_mean = sampling, control_mean
+            self._sample_mean = np.zeros_like(sample_mean)
+            self._sample_comoment = np.zeros_like(sample_comoment)
+        elif sampling != self._sampling or (control_mean is None) != (self._control_mean is None):
+            raise ValueError("chunks must share the sampling and the control variate")
+        _merge_moments(self._n, self._rate_mean[None], self._rate_m2[None, None], n, rate_mean[None],
+                       rate_m2[None, None])
+        _merge_moments(self._n_samples, self._sample_mean, self._sample_comoment, n_samples, sample_mean,
+                       sample_comoment)
+        self._n += n
+        self._n_samples += n_samples
+
+    def update(self, simulation: Simulation) -> None:
+        """Add the paths of a Simulation chunk"""
+        if simulation.get_steps != self._steps or simulation.get_dt != self._dt:
+            raise ValueError("chunks must share the number of steps and dt")
+        rates, sampling = simulation.get_sim, simulation.get_sampling
+        # discount factors first, then the same buffer holds the rate deviations
+        buffer = simulation.discount_factor()
+        control = simulation.control_variate(buffer)
+        samples = [_sample_units(buffer, sampling)] + ([] if control is None else [_sample_units(control, sampling)])
+        sample_mean = np.stack([sample.mean(axis=1) for sample in samples])
+        for sample, mean in zip(samples, sample_mean):
+            sample -= mean[:, None]
+        sample_comoment = np.array([[np.einsum("ij,ij->i", a, b) for b in samples] for a in samples])
+        rate_mean = rates.mean(axis=1)
+        np.subtract(rates, rate_mean[:, None], out=buffer)
+        rate_m2 = np.einsum("ij,ij->i", buffer, buffer)
+        self._combine(rates.shape[1], rate_mean, rate_m2, samples[0].shape[1], sampling,
+                      simulation.get_control_mean, sample_mean, sample_comoment)
+
+    def merge(self, other: "SimulationAggregate") -> None:
+        """Add the statistics of an aggregate of other paths"""
+        if other.get_steps != self._steps or other.get_dt != self._dt:
+            raise ValueError("aggregates must share the number of steps and dt")
+        if other.get_nb_samples:
+            self._combine(other.get_nb_sim, other.get_attr("_rate_mean"), other.get_attr("_rate_m2"),
+                          other.get_nb_samples, other.get_attr("_sampling"), other.get_attr("_control_mean"),
+                          other.get_attr("_sample_mean"), other.get_attr("_sample_comoment"))
+
+    def mean_rate(self) -> np.ndarray:
+        return self._rate_mean.copy()
+
+    def rate_variance(self) -> np.ndarray:
+        """Sample variance of the rate at every step"""
+        return self._rate_m2 / max(self._n - 1, 1)
+
+    def _control_coefficient(self) -> np.ndarray:
+        """Variance minimizing coefficient cov(D, X) / var(X) of the control variate of every step"""
+        comoment = self._sample_comoment
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(comoment[1, 1] > 0, comoment[0, 1] / comoment[1, 1], 0.)
+
+    def discount_factor(self) -> np.ndarray:
+        """Estimated discount factor of every step: the mean over paths, minus c (mean control - its
+        analytic mean) when the paths carry a control variate"""
+        if self._sample_mean is None:
+            return np.zeros(self._steps)
+        if self._control_mean is None:
+            return self._sample_mean[0].copy()
+        return self._sample_mean[0] - self._control_coefficient() * (self._sample_mean[1] - self._control_mean)
+
+    def discount_variance(self) -> np.ndarray:
+        """Sample variance of the discount factor per independent sample at every step, of the control
+        variate adjusted discount factor when there is a control"""
+        if self._sample_comoment is None:
+            return np.zeros(self._steps)
+        m2 = self._sample_comoment[0, 0]
+        if self._control_mean is not None:
+            m2 = m2 - self._control_coefficient() * self._sample_comoment[0, 1]
+        return np.maximum(m2, 0.) / max(self._n_samples - 1, 1)
+
+    def discount_standard_error(self) -> np.ndarray:
+        """Standard error of the estimated discount factor of every step, nan below two independent samples
+        (a single Sobol chunk gives no error estimate)"""
+        if self._n_samples < 2:
+            return np.full(self._steps, np.nan)
+        return np.sqrt(self.discount_variance() / self._n_samples)
+
+    def yield_standard_error(self) -> np.ndarray:
+        """Standard error of the annually compounded yield of every step, by the delta method"""
+        t = self.get_time
+        discount = self.discount_factor()
+        return self.discount_standard_error() * discount ** (-1 / t - 1) / t
+
+    def yield_curve(self) -> Curve:
+        """Annually compounded yields implied by the estimated discount factor of every step"""
+        return _yield_curve(self.discount_factor(), self.get_time)
+
+
+class ShortRateSimulator:
+    """Chunked and streamed simulation shared by the short rate models.
+
+    A model provides simulate_paths(n, scheme, sampling, control_variate, rng) and keeps the
+    SeedSequence of its seed in _seed.
+    """
+
+    @staticmethod
+    def _is_valid_seed(seed: Any) -> np.random.SeedSequence:
+        """SeedSequence of an integer seed, None drawing fresh entropy"""
+        return seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+    def set_attr(self, attr: str, x: Any) -> None:
+        """Attributes setter, a new _seed also rebuilding the generator the paths are drawn from"""
+        if attr == "_seed":
+            x = self._is_valid_seed(x)
+        self.__setattr__(attr, x)
+        if attr == "_seed":
+            self._rng = np.random.default_rng(x)
+
+    def spawn_seeds(self, n: int, seed: Any = None) -> list:
+        """n independent child SeedSequences, one per chunk of paths.
+
+        Without seed they are spawned from the model seed, whose spawn counter advances: successive
+        calls give new paths and a model rebuilt with the same seed replays the same sequence of calls.
+        With seed (int or SeedSequence, left untouched) they are spawned from a fresh sequence, so
+        every call with that seed gives the same children.
+        """
+        if seed is None:
+            return self._seed.spawn(n)
+        if isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key, pool_size=seed.pool_size)
+        return self._is_valid_seed(seed).spawn(n)
+
+    def simulate_chunks(self, n: int, chunk_size: int = 1000, scheme: str = "euler", sampling: str = "plain",
+                        control_variate: bool = False, seed: Any = None) -> Iterator[Simulation]:
+        """Generator of Simulation chunks of chunk_size paths (the last one smaller) adding up to n paths,
+        every chunk drawing from its own stream of spawn_seeds(n_chunks, seed): pass seed to get the
+        same paths on every call, by default each call continues the model seed"""
+        check_scheme(scheme)
+        sizes = sampling_chunk_sizes(n, chunk_size, sampling)
+        return self._chunks(sizes, self.spawn_seeds(len(sizes), seed), scheme, sampling, control_variate)
+
+    def _chunks(self, sizes: list, seeds: list, scheme: str, sampling: str,
+                control_variate: bool) -> Iterator[Simulation]:
+        for size, seed in zip(sizes, seeds):
+            yield self.simulate_paths(size, scheme, sampling, control_variate, np.random.default_rng(seed))
+
+    def simulate_stream(self, n: int, chunk_size: int = 1000, scheme: str = "euler", sampling: str = "plain",
+                        control_variate: bool = False, seed: Any = None) -> SimulationAggregate:
+        """Running statistics of n paths simulated chunk by chunk, peak memory set by chunk_size"""
+        return SimulationAggregate.from_chunks(self.simulate_chunks(n, chunk_size, scheme, sampling, control_variate,
+                                                                    seed))
+
+    def simulate_parallel(self, n: int, chunk_size: int = 1000, workers: Optional[int] = None, scheme: str = "euler",
+                          sampling: str = "plain", control_variate: bool = False, stream: bool = False,
+                          seed: Any = None) -> Union[Simulation, SimulationAggregate]:
+        """simulate_chunks run in a pool of worker processes, merged into one Simulation or, with
+        stream=True, into a SimulationAggregate; bit-identical whatever the number of workers. seed
+        works as in simulate_chunks."""
+        check_scheme(scheme)
+        check_sampling(sampling)
+        return simulate_parallel(self, n, chunk_size, workers, stream, seed, scheme=scheme, sampling=sampling,
+                                 control_variate=control_variate)
@@ -0,0 +1,198 @@
+from typing import Any, Optional, Tuple, Union
+import json
+import os
+
+import numpy as np
+from PyCurve.bjork_christensen import BjorkChristensen
+from PyCurve.bjork_christensen_augmented import BjorkChristensenAugmented
+from PyCurve.curve import CURVE_PRECISIONS, Curve
+from PyCurve.nelson_siegel import NelsonSiegel
+from PyCurve.svensson_nelson_siegel import NelsonSiegelAugmented
+
+MODELS: dict = {model.__name__: model for model in (NelsonSiegel, NelsonSiegelAugmented, BjorkChristensen,
+                                                    BjorkChristensenAugmented)}
+
+
+class CurveStore:
+    """Column-oriented on-disk history of daily curves or calibrated model parameters.
+
+    A store is a directory holding meta.json, the date index dates.bin (int64 days since 1970-01-01,
+    strictly increasing) and one raw binary file per column: one per tenor for a curve panel, one per
+    parameter for a model history. Columns are opened with np.memmap, so reading a date range or a
+    single tenor only touches those bytes. An append writes at the end of every file and then
+    commits the new row count in meta.json; rows beyond that count are ignored, so an interrupted
+    append leaves the store readable.
+
+    CurveStore(path, tenors=...) or CurveStore(path, model=...) creates a store and CurveStore(path)
+    opens an existing one.
+    """
+
+    def __init__(self, path: str, tenors: Optional[Union[np.ndarray, list]] = None, model: Any = None,
+                 precision: str = "float64") -> None:
+        self._path = path
+        if os.path.exists(os.path.join(path, "meta.json")):
+            if tenors is not None or model is not None:
+                raise ValueError("store %s already exists" % path)
+            with open(os.path.join(path, "meta.json")) as file:
+                self._meta = json.load(file)
+        else:
+            self._meta = self._new_meta(tenors, model, precision)
+            os.makedirs(path, exist_ok=True)
+            for name in self._files():
+                open(os.path.join(path, name), "wb").close()
+            self._commit(0)
+        self._dtype = np.dtype(self._meta["dtype"])
+        self._maps: Optional[tuple] = None
+
+    @staticmethod
+    def _new_meta(tenors: Any, model: Any, precision: str) -> dict:
+        if (tenors is None) == (model is None):
+            raise ValueError("a new store needs either tenors or a model")
+        if precision not in CURVE_PRECISIONS:
+            raise TypeError("precision must be 'float64' or 'float32'")
+        if model is not None:
+            if type(model).__name__ not in MODELS:
+                raise ValueError("model must be a NelsonSiegel, NelsonSiegelAugmented, BjorkChristensen or "
+                                 "BjorkChristensenAugmented instance")
+            return {"kind": "model", "model": type(model).__name__, "columns": list(model.attr_list),
+                    "dtype": precision, "rows": 0}
+        tenors = Curve._is_sorted(Curve._is_valid_attr(tenors))
+        return {"kind": "curve", "columns": tenors.tolist(), "dtype": precision, "rows": 0}
+
+    def _files(self) -> list:
+        return ["dates.bin"] + ["column_%d.bin" % j for j in range(len(self._meta["columns"]))]
+
+    def _commit(self, rows: int) -> None:
+        """Write the row count through a temporary file so readers always see a complete meta.json"""
+        self._meta["rows"] = rows
+        temporary = os.path.join(self._path, "meta.json.tmp")
+        with open(temporary, "w") as file:
+            json.dump(self._meta, file)
+        os.replace(temporary, os.path.join(self._path, "meta.json"))
+        self._maps = None
+
+    def get_attr(self, attr: str) -> Any:
+        return self.__getattribute__(attr)
+
+    def __len__(self) -> int:
+        return self._meta["rows"]
+
+    def __repr__(self) -> str:
+        return "CurveStore(%s, %d rows x %d columns)" % (self._path, len(self), len(self._meta["columns"]))
+
+    @property
+    def kind(self) -> str:
+        return self._meta["kind"]
+
+    @property
+    def model_type(self) -> Optional[type]:
+        """Model class of a model store, None for a curve store"""
+        return MODELS[self._meta["model"]] if self.kind == "model" else None
+
+    @property
+    def columns(self) -> list:
+        """Tenors of a curve store, parameter names of a model store"""
+        return list(self._meta["columns"])
+
+    def _memmaps(self) -> tuple:
+        """Read-only memmaps of the date index and of every column, reopened after each append"""
+        if self._maps is None:
+            rows = len(self)
+            if rows == 0:
+                self._maps = (np.empty(0, dtype="datetime64[D]"),) + tuple(
+                    np.empty(0, dtype=self._dtype) for _ in self._meta["columns"])
+            else:
+                files = self._files()
+                dates = np.memmap(os.path.join(self._path, files[0]), dtype=np.int64, mode="r", shape=(rows,))
+                self._maps = (dates.view("datetime64[D]"),) + tuple(
+                    np.memmap(os.path.join(self._path, name), dtype=self._dtype, mode="r", shape=(rows,))
+                    for name in files[1:])
+        return self._maps
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._memmaps()[0]
+
+    def _rows(self, start: Any = None, end: Any = None) -> slice:
+        """Row slice of the dates in [start, end], both bounds optional"""
+        dates = self.dates
+        first = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+        last = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        return slice(first, last)
+
+    def _row(self, date: Any) -> int:
+        dates = self.dates
+        i = int(np.searchsorted(dates, np.datetime64(date, "D")))
+        if i == len(dates) or dates[i] != np.datetime64(date, "D"):
+            raise ValueError("date %s is not in the store" % date)
+        return i
+
+    def _column_index(self, column: Any) -> int:
+        columns = self._meta["columns"]
+        if self.kind == "curve":
+            column = float(column)
+        if column not in columns:
+            raise ValueError("column %s is not in the store" % column)
+        return columns.index(column)
+
+    def column(self, column: Any, start: Any = None, end: Any = None) -> np.ndarray:
+        """History of one tenor or parameter between two dates, a read-only view on the file"""
+        return self._memmaps()[1 + self._column_index(column)][self._rows(start, end)]
+
+    def panel(self, start: Any = None, end: Any = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Dates and the (dates x columns) values between two dates, reading only those rows"""
+        rows = self._rows(start, end)
+        maps = self._memmaps()
+        return np.array(maps[0][rows]), np.stack([values[rows] for values in maps[1:]], axis=1)
+
+    def curve(self, date: Any) -> Curve:
+        """Curve observed on a date"""
+        if self.kind != "curve":
+            raise TypeError("curve() needs a curve store, use model() on a model store")
+        i = self._row(date)
+        return Curve(self._meta["columns"], [values[i] for values in self._memmaps()[1:]], self._meta["dtype"])
+
+    def model(self, date: Any) -> Any:
+        """Model instance holding the parameters stored for a date"""
+        if self.kind != "model":
+            raise TypeError("model() needs a model store, use curve() on a curve store")
+        i = self._row(date)
+        return MODELS[self._meta["model"]](*(float(values[i]) for values in self._memmaps()[1:]))
+
+    def _values(self, observation: Any) -> np.ndarray:
+        """Row of values of a Curve, a model instance or a plain array"""
+        if isinstance(observation, Curve):
+            if self.kind != "curve" or observation.get_time.tolist() != self._meta["columns"]:
+                raise ValueError("Curve times must match the store tenors")
+            return observation.get_rate
+        if self.kind == "model" and not isinstance(observation, np.ndarray) and hasattr(observation, "attr_list"):
+            if type(observation).__name__ != self._meta["model"]:
+                raise ValueError("model must be a %s instance" % self._meta["model"])
+            return np.array([observation.get_attr(attr) for attr in self._meta["columns"]])
+        return np.asarray(observation, dtype=np.float64)
+
+    def append(self, date: Any, observation: Any) -> None:
+        """Add the observation (Curve, model instance or array of values) of a date after the last one"""
+        self.extend([date], self._values(observation)[None, :])
+
+    def extend(self, dates: Any, values: Union[np.ndarray, list]) -> None:
+        """Add (dates x columns) values in one write per file, dates increasing after the last stored"""
+        days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        values = np.asarray(values, dtype=self._dtype)
+        if days.ndim != 1 or values.shape != (days.shape[0], len(self._meta["columns"])):
+            raise ValueError("values must be a (dates x columns) array")
+        if not np.isfinite(values).all():
+            raise ValueError("values must be finite")
+        last = self.dates[-1].astype(np.int64) if len(self) else None
+        if np.any(np.diff(days) <= 0) or (last is not None and days.size and days[0] <= last):
+            raise ValueError("dates must be strictly increasing and after the last stored date")
+        rows = len(self)
+        self._maps = None
+        size = {"dates.bin": 8}
+        for name, data in zip(self._files(), [days] + list(values.T)):
+            with open(os.path.join(self._path, name), "r+b") as file:
+                # drop the tail of an interrupted append before writing
+                file.truncate(rows * size.get(name, self._dtype.itemsize))
+                file.seek(0, os.SEEK_END)
+                file.write(np.ascontiguousarray(data).tobytes())
+        self._commit(rows + days.shape[0])
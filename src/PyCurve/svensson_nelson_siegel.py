@@ -1,18 +1,24 @@
-from typing import Any, Union
+from typing import Any, Callable, Optional, Tuple, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
-import scipy.optimize as sco
 from PyCurve.actuarial_implementation import discrete_df, continuous_df
+from PyCurve.calibration import CalibrationReport, calibrate_panel, calibrate_parallel, fit, fit_prices
 from PyCurve.curve import Curve
+from PyCurve.loadings import (as_time_array, check_precision, decay_loadings, decay_loadings_dtau, forward_loadings,
+                              forward_loadings_dt, loading_cache, sum_squared_errors)
 
 
 np.seterr(divide='ignore', invalid='ignore')
 
 
 class NelsonSiegelAugmented:
+    _x0: np.ndarray = np.array([1, 0, 0, 0, 1, 1])
+    _n_taus: int = 2
+    _boundaries: tuple = ((1e-6, np.inf), (-30, 30), (-30, 30), (-30, 30), (1e-6, 30), (1e-6, 30))
 
-    def __init__(self, beta0: float, beta1: float, beta2: float, beta3: float, tau: float, tau2: float) -> None:
+    def __init__(self, beta0: float, beta1: float, beta2: float, beta3: float, tau: float, tau2: float,
+                 precision: str = "float64") -> None:
         self.beta0: float = self._is_positive_attr(beta0)
         self.beta1: float = beta1
         self.beta2: float = beta2
@@ -20,6 +26,7 @@ class NelsonSiegelAugmented:
         self.tau: float = self._is_positive_attr(tau)
         self.tau2: float = self._is_positive_attr(tau2)
         self.attr_list: list = ["beta0", "beta1", "beta2", "beta3", "tau", "tau2"]
+        self.precision: str = check_precision(precision)
 
     @staticmethod
     def _is_valid_curve(curve: Any) -> Curve:
@@ -41,6 +48,8 @@ class NelsonSiegelAugmented:
     def set_attr(self, attr: str, x: float) -> None:
         if attr in (["beta0", "tau", "tau2"]):
             self.__setattr__(attr, self._is_positive_attr(x))
+        if attr == "precision":
+            x = check_precision(x)
         self.__setattr__(attr, x)
 
     def _print_model(self) -> None:
@@ -51,13 +60,36 @@ class NelsonSiegelAugmented:
         print(28 * "_")
 
     @staticmethod
-    def _calibration_func(x: list, curve: Curve) -> float:
-        ns = NelsonSiegelAugmented(x[0], x[1], x[2], x[3], x[4], x[5])
-        curve_estim = np.ones(len(curve.get_time))
-        for i in range(len(curve.get_time)):
-            curve_estim[i] = ns.d_rate(curve.get_time[i])
-        sqr_error_sum = ((curve_estim - curve.get_rate) ** 2).sum()
-        return sqr_error_sum
+    def _loadings(t, tau, tau2, precision: str = "float64") -> np.ndarray:
+        """Factor loading matrix [1, slope, curvature, second curvature], broadcasting t against the taus"""
+        slope, curvature = decay_loadings(t, tau, precision)
+        _, curvature_2 = decay_loadings(t, tau2, precision)
+        slope, curvature, curvature_2 = np.broadcast_arrays(slope, curvature, curvature_2)
+        return np.stack([np.ones_like(slope), slope, curvature, curvature_2], axis=-1)
+
+    @staticmethod
+    def _forward_loadings(t, tau, tau2, precision: str = "float64") -> np.ndarray:
+        """Instantaneous forward loading matrix [1, e^-x, x e^-x, x2 e^-x2], broadcasting t against the taus"""
+        decay, hump = forward_loadings(t, tau, precision)
+        _, hump_2 = forward_loadings(t, tau2, precision)
+        decay, hump, hump_2 = np.broadcast_arrays(decay, hump, hump_2)
+        return np.stack([np.ones_like(decay), decay, hump, hump_2], axis=-1)
+
+    @staticmethod
+    def _rate_and_jac(x: np.ndarray, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Rates of the parameter vector x on the tenor grid and their (params x tenors) derivatives"""
+        slope, curvature, d_slope, d_curvature = decay_loadings_dtau(t, x[4])
+        _, curvature_2, _, d_curvature_2 = decay_loadings_dtau(t, x[5])
+        rate = x[0] + x[1] * slope + x[2] * curvature + x[3] * curvature_2
+        jac = np.stack([np.ones_like(slope), slope, curvature, curvature_2,
+                        x[1] * d_slope + x[2] * d_curvature, x[3] * d_curvature_2])
+        return rate, jac
+
+    @classmethod
+    def _calibration_func(cls, x: np.ndarray, t: np.ndarray, rt: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Sum of squared errors over the whole tenor grid and its closed-form gradient"""
+        rate, jac = cls._rate_and_jac(x, t)
+        return sum_squared_errors(jac, rate - rt)
 
     def _print_fitting(self, res) -> None:
         self._print_model()
@@ -69,37 +101,67 @@ class NelsonSiegelAugmented:
         print("Number of Iterations", res.nit)
         print(28 * "_")
 
-    def calibrate(self, curve) -> sco.OptimizeResult:
+    def calibrate(self, curve, method: str = "local", verbose: bool = False,
+                  callback: Optional[Callable[[CalibrationReport], None]] = None) -> CalibrationReport:
+        """Fit the model to a Curve, method being 'local' (L-BFGS-B from a fixed start), 'profile'
+        (tau grid with least-squares betas) or 'global' (vectorized differential evolution), the last
+        two being refined locally ('global' keeps the better of its polished candidates and of the local
+        fit). The fitting summary is only printed when verbose, callback
+        receives the CalibrationReport."""
         self._is_valid_curve(curve)
-        x0 = np.array([1, 0, 0, 0, 1, 1])
-        boundaries = ((1e-6, np.inf), (-30, 30), (-30, 30), (-30, 30), (1e-6, 30), (1e-6, 30))
-        calibration_result = sco.minimize(self._calibration_func, x0, method='L-BFGS-B', args=curve, bounds=boundaries)
+        calibration_result = fit(self, as_time_array(curve.get_time), as_time_array(curve.get_rate), method,
+                                 callback)
         i = 0
         for attr in self.attr_list:
             self.set_attr(attr, calibration_result.x[i])
             i += 1
-        self._print_fitting(calibration_result)
+        if verbose:
+            self._print_fitting(calibration_result)
+        return calibration_result
+
+    def calibrate_prices(self, cashflows: Any, t: (np.ndarray, list), prices: (np.ndarray, list),
+                         weights: Any = None, compounding: str = "discrete", verbose: bool = False,
+                         callback: Optional[Callable[[CalibrationReport], None]] = None) -> CalibrationReport:
+        """Fit the model to bond dirty prices from a (bonds x payment dates) cash-flow matrix, dense or
+        scipy.sparse, paid at times t. weights may be None, 'duration' or one weight per bond and
+        compounding follows df_t ('discrete') or cdf_t ('continuous')."""
+        calibration_result = fit_prices(self, cashflows, t, prices, weights, compounding, callback=callback)
+        for attr, x in zip(self.attr_list, calibration_result.x):
+            self.set_attr(attr, x)
+        if verbose:
+            self._print_fitting(calibration_result)
         return calibration_result
 
+    @classmethod
+    def calibrate_panel(cls, t: (np.ndarray, list), rates: np.ndarray,
+                        x0: Optional[np.ndarray] = None, warm_start: bool = True) -> np.ndarray:
+        """Calibrate a (dates x tenors) panel silently, warm starting each date from the previous one"""
+        return calibrate_panel(cls, t, rates, x0, warm_start)
+
+    @classmethod
+    def calibrate_parallel(cls, t: (np.ndarray, list), rates: np.ndarray, x0: Optional[np.ndarray] = None,
+                           warm_start: bool = True, max_workers: Optional[int] = None,
+                           chunk_size: Optional[int] = None) -> np.ndarray:
+        """Calibrate many independent curves across a process pool, results in input order"""
+        return calibrate_parallel(cls, t, rates, x0, warm_start, max_workers, chunk_size)
+
     def _time_decay(self, t) -> Union[np.ndarray, float]:
-        return self.beta1 * (np.array(((1 - np.exp(-np.array(t, np.longdouble) / self.tau)) /
-                                       (np.array(t, np.longdouble) / self.tau))))
+        return self.beta1 * decay_loadings(t, self.tau, self.precision)[0]
 
     def _hump(self, t) -> Union[np.ndarray, float]:
-        return self.beta2 * np.subtract(np.array(((1 - np.exp(-np.array(t, np.longdouble) / self.tau)) /
-                                                  (np.array(t, np.longdouble) / self.tau))),
-                                        np.array(np.exp(-np.array(t, np.longdouble) / self.tau)))
+        return self.beta2 * decay_loadings(t, self.tau, self.precision)[1]
 
     def _second_hump(self, t) -> Union[np.ndarray, float]:
-        return self.beta3 * np.subtract(np.array(((1 - np.exp(-np.array(t, np.longdouble) / self.tau2)) /
-                                                  (np.array(t, np.longdouble) / self.tau2))),
-                                        np.array(np.exp(-np.array(t, np.longdouble) / self.tau2)))
+        return self.beta3 * decay_loadings(t, self.tau2, self.precision)[1]
+
+    def _loading_matrix(self, t) -> np.ndarray:
+        """Loading matrix of the tenor grid t under the current decay parameters, shared through loading_cache"""
+        return loading_cache.get(type(self), (self.tau, self.tau2), self.precision, t,
+                                 lambda: self._loadings(t, self.tau, self.tau2, self.precision))
 
     def d_rate(self, t) -> Union[np.ndarray, float]:
-        first_coefficient = self._time_decay(t)
-        second_coefficient = self._hump(t)
-        third_coefficient = self._second_hump(t)
-        return self.beta0 + first_coefficient + second_coefficient + third_coefficient
+        loadings = self._loading_matrix(t)
+        return loadings @ np.array([self.beta0, self.beta1, self.beta2, self.beta3], dtype=loadings.dtype)
 
     def plot_calibrated(self, curve: Curve) -> None:
         fig = plt.figure(figsize=(12.5, 8))
@@ -160,11 +222,26 @@ class NelsonSiegelAugmented:
         plt.show()
         return fig
 
+    def instantaneous_forward(self, t) -> Union[np.ndarray, float]:
+        """Closed-form instantaneous forward d(t r(t))/dt = beta0 + beta1 e^-x + beta2 x e^-x + beta3 x2 e^-x2 with x = t / tau"""
+        loadings = self._forward_loadings(t, self.tau, self.tau2, self.precision)
+        return loadings @ np.array([self.beta0, self.beta1, self.beta2, self.beta3], dtype=loadings.dtype)
+
+    def instantaneous_forward_dt(self, t) -> Union[np.ndarray, float]:
+        """Closed-form time derivative of the instantaneous forward"""
+        d_decay, d_hump = forward_loadings_dt(t, self.tau, self.precision)
+        _, d_hump_2 = forward_loadings_dt(t, self.tau2, self.precision)
+        return self.beta1 * d_decay + self.beta2 * d_hump + self.beta3 * d_hump_2
+
+    def forward_curve(self, t: (np.ndarray, list)) -> Curve:
+        """Curve of instantaneous forwards on the time grid t, as consumed by HullWhite"""
+        return Curve(t, self.instantaneous_forward(as_time_array(t)))
+
     def df_t(self, t) -> Union[np.ndarray, float]:
-        return discrete_df(self.d_rate(t), t)
+        return discrete_df(self.d_rate(t), t, overwrite=True)
 
     def cdf_t(self, t) -> Union[np.ndarray, float]:
-        return continuous_df(self.d_rate(t), t)
+        return continuous_df(self.d_rate(t), t, overwrite=True)
 
     def forward_rate(self, t_1, t_2) -> Union[np.ndarray, float]:
         return ((self.d_rate(t_2) * t_2) - (self.d_rate(t_1) * t_1)) / (t_2 - t_1)
@@ -0,0 +1,84 @@
+from typing import Any, Iterable, Optional, Tuple, Union
+
+import numpy as np
+from PyCurve.curve import Curve
+
+
+class TabulatedCurve:
+    """Lookup-table mode of any curve object exposing d_rate and df_t (LinearCurve, CubicCurve,
+    LogDiscountCurve and the parametric models).
+
+    Rates and discount factors are sampled once on a uniform grid of the given step over [t_min, t_max];
+    a query is then an O(1) index computation and a linear blend between two grid points, whatever the
+    cost of the model. Linear interpolation of a smooth function is off by at most step^2 / 8 times its
+    second derivative, error_bound estimates it from the second differences of the table and max_error
+    measures it against the model at the middle of every cell.
+    """
+
+    def __init__(self, model: Any, t_max: float, t_min: float = 0., step: float = 1 / 365) -> None:
+        self._model = self._is_valid_model(model)
+        if not t_max > t_min or step <= 0:
+            raise ValueError("t_max must be greater than t_min and step positive")
+        self._n_cells = int(np.ceil((t_max - t_min) / step - 1e-9))
+        self._t_min = float(t_min)
+        self._step = (t_max - t_min) / self._n_cells
+        self._inv_step = 1 / self._step
+        self._grid = self._t_min + self._step * np.arange(self._n_cells + 1)
+        self._rate = np.ascontiguousarray(model.d_rate(self._grid), dtype=np.float64)
+        self._df = np.ascontiguousarray(model.df_t(self._grid), dtype=np.float64)
+        self._rate_slope = np.append(np.diff(self._rate), 0.)
+        self._df_slope = np.append(np.diff(self._df), 0.)
+        self._max_error: Optional[dict] = None
+        for table in (self._grid, self._rate, self._df, self._rate_slope, self._df_slope):
+            table.setflags(write=False)
+
+    @staticmethod
+    def _is_valid_model(model: Any) -> Any:
+        if not (hasattr(model, "d_rate") and hasattr(model, "df_t")):
+            raise ValueError("model must expose d_rate(t) and df_t(t)")
+        return model
+
+    def get_attr(self, attr: str) -> Any:
+        return self.__getattribute__(attr)
+
+    @property
+    def error_bound(self) -> dict:
+        """Estimated worst linear blending error, max |second difference| / 8, for rates and discount factors"""
+        return {"rate": float(np.abs(np.diff(self._rate, 2)).max(initial=0)) / 8,
+                "df": float(np.abs(np.diff(self._df, 2)).max(initial=0)) / 8}
+
+    def max_error(self) -> dict:
+        """Largest absolute difference with the exact model at the cell midpoints, computed once"""
+        if self._max_error is None:
+            middle = self._grid[:-1] + self._step / 2
+            self._max_error = {
+                "rate": float(np.abs(self.d_rate(middle) - np.asarray(self._model.d_rate(middle))).max()),
+                "df": float(np.abs(self.df_t(middle) - np.asarray(self._model.df_t(middle))).max())}
+        return self._max_error
+
+    def _locate(self, t: Union[np.ndarray, Iterable, int, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Cell index and blending weight of every query time"""
+        position = (np.asarray(t, dtype=np.float64) - self._t_min) * self._inv_step
+        if position.size and not (position.min() >= 0 and position.max() <= self._n_cells):
+            raise ValueError("Times must lie inside the tabulated range")
+        index = np.minimum(position.astype(np.intp), self._n_cells - 1)
+        return index, position - index
+
+    def d_rate(self, t: Union[np.ndarray, Iterable, int, float]) -> Union[np.ndarray, Iterable, int, float]:
+        """Given a maturity return a d_rate"""
+        index, weight = self._locate(t)
+        return self._rate[index] + weight * self._rate_slope[index]
+
+    def df_t(self, t: Union[np.ndarray, Iterable, int, float]) -> Union[np.ndarray, Iterable, int, float]:
+        """Given a maturity return a discount factor"""
+        index, weight = self._locate(t)
+        return self._df[index] + weight * self._df_slope[index]
+
+    def forward(self, t_1: Union[np.ndarray, Iterable, int, float],
+                t_2: Union[np.ndarray, Iterable, int, float]) -> Union[np.ndarray, Iterable, int, float]:
+        """Given two times return the forward d_rate between t_1/t_2"""
+        return ((self.d_rate(t_2) * t_2) - (self.d_rate(t_1) * t_1)) / (t_2 - t_1)
+
+    def create_curve(self, t_array: Union[np.ndarray, Iterable, int, float]) -> Curve:
+        """Given an array of time create a new curve"""
+        return Curve(t_array, self.d_rate(t_array))
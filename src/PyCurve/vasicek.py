@@ -1,40 +1,68 @@
-from typing import Union
+from typing import Any, Optional, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
 from PyCurve.curve import Curve
 
-from PyCurve.simulation import Simulation
+from PyCurve.simulation import (ShortRateSimulator, Simulation, check_scheme, exact_paths, ou_zero_coupon,
+                                standard_normals)
 
 
 
 
-class Vasicek:
+class Vasicek(ShortRateSimulator):
 
-    def __init__(self, alpha: float, beta: float, sigma: float, rt: float, time: float, delta_time: float) -> None:
+    def __init__(self, alpha: float, beta: float, sigma: float, rt: float, time: float, delta_time: float,
+                 seed: Any = None) -> None:
         self._alpha = alpha
         self._beta = beta
         self._sigma = sigma
         self._rt = rt
         self._dt = delta_time
         self._steps = int(time / delta_time)
+        self._seed = self._is_valid_seed(seed)
+        self._rng = np.random.default_rng(self._seed)
 
     def get_attr(self, attr: str) -> Union[float, int]:
         return self.__getattribute__(attr)
 
     def _sigma_part(self, n: int) -> float:
-        return self.get_attr("_sigma") * np.sqrt(self.get_attr("_dt")) * np.random.normal(size=n)
+        return self.get_attr("_sigma") * np.sqrt(self.get_attr("_dt")) * self._rng.standard_normal(n)
 
     def _mu_dt(self, rt: np.ndarray) -> float:
         return self.get_attr("_alpha") * (self.get_attr("_beta") - rt) * self.get_attr("_dt")
 
-    def simulate_paths(self, n: int) -> np.array:
+    def zero_coupon_price(self) -> np.ndarray:
+        """Analytic zero-coupon prices A(t) e^(-B(t) rt) at the simulated times dt, 2 dt, ..."""
+        steps = self.get_attr("_steps")
+        return ou_zero_coupon(self._rt - self._beta, np.full(steps, self._beta * self._dt), self._alpha,
+                              self._sigma, self._dt)
+
+    def simulate_paths(self, n: int, scheme: str = "euler", sampling: str = "plain",
+                       control_variate: bool = False, rng: Optional[np.random.Generator] = None) -> Simulation:
+        """n short rate paths by Euler steps, or sampled exactly with their step integrals (scheme='exact').
+
+        sampling draws the shocks as 'plain' normals, 'antithetic' pairs or scrambled 'sobol' points, and
+        control_variate (exact scheme only) attaches the analytic one-step bond price as a control.
+        Sobol sampling keeps its balance properties only for a power of two n, antithetic needs an even n.
+        Shocks come from rng, the model generator seeded at construction by default.
+        """
+        rng = self._rng if rng is None else rng
+        if check_scheme(scheme) == "exact":
+            steps = self.get_attr("_steps")
+            return exact_paths(self._rt - self._beta, np.full(steps, float(self._beta)),
+                               np.full(steps, self._beta * self._dt), self._alpha, self._sigma, self._dt, n,
+                               sampling, control_variate, rng)
+        if control_variate:
+            raise ValueError("control variates need scheme='exact'")
         simulation = np.zeros(shape=(self.get_attr("_steps"), n))
         simulation[0, :] = self._rt
+        shocks = standard_normals(self.get_attr("_steps") - 1, n, sampling, rng=rng)[0]
+        shocks *= self.get_attr("_sigma") * np.sqrt(self.get_attr("_dt"))
         for i in range(1, self.get_attr("_steps"), 1):
-            dr = self._mu_dt(simulation[i - 1, :]) + self._sigma_part(n)
+            dr = self._mu_dt(simulation[i - 1, :]) + shocks[i - 1]
             simulation[i, :] = simulation[i - 1, :] + dr
-        return Simulation(simulation, self.get_attr("_dt"))
+        return Simulation(simulation, self.get_attr("_dt"), sampling=sampling)
 
     @staticmethod
     def plot_calibrated(simul: Simulation, instantaneous_forward: Curve) -> None:
@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+from PyCurve.actuarial_implementation import (CONVENTIONS, UNITS, continuous_df, continuous_rate, df_to_rate,
+                                              discrete_df, discrete_rate, rate_to_df)
+
+
+class TestActuarial(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.r = rng.uniform(-1, 8, 1000)
+        self.t = rng.uniform(0.01, 50, 1000)
+
+    def test_conventions(self) -> None:
+        r, t = self.r, self.t
+        self.assertTrue(np.allclose(discrete_df(r, t), (1 + r / 100) ** -t, rtol=1e-13))
+        self.assertTrue(np.allclose(continuous_df(r, t), np.exp(-r / 100 * t), rtol=1e-13))
+        self.assertTrue(np.allclose(rate_to_df(r, t, "simple"), 1 / (1 + r / 100 * t), rtol=1e-13))
+        self.assertTrue(np.allclose(rate_to_df(r / 100, t, "periodic", "decimal", frequency=2),
+                                    (1 + r / 200) ** (-2 * t), rtol=1e-13))
+        for convention in CONVENTIONS:
+            for unit in UNITS:
+                rate = r if unit == "percent" else r / 100
+                df = rate_to_df(rate, t, convention, unit, frequency=4)
+                self.assertTrue(np.allclose(df_to_rate(df, t, convention, unit, frequency=4), rate, atol=1e-12))
+        self.assertRaises(TypeError, lambda: rate_to_df(r, t, "quarterly"))
+        self.assertRaises(TypeError, lambda: df_to_rate(r, t, unit="bp"))
+
+    def test_rates(self) -> None:
+        self.assertAlmostEqual(continuous_rate(np.exp(-0.03 * 2), 2), 0.03, 15)
+        self.assertAlmostEqual(discrete_rate(1.03 ** -2, 2), 0.03, 15)
+        self.assertIsInstance(discrete_df(1., 2.), float)
+
+    def test_buffers(self) -> None:
+        out = np.empty_like(self.r)
+        self.assertIs(discrete_df(self.r, self.t, out=out), out)
+        self.assertTrue(np.array_equal(out, discrete_df(self.r, self.t)))
+        rates = self.r.copy()
+        self.assertIs(continuous_df(rates, self.t, overwrite=True), rates)
+        self.assertTrue(np.array_equal(rates, continuous_df(self.r, self.t)))
+        rates = self.r.copy()
+        self.assertIsNot(continuous_df(rates, 5.), rates)
+        self.assertTrue(np.array_equal(rates, self.r))
+        self.assertIsNot(continuous_df(rates[:1], self.t, overwrite=True), rates)
+        self.assertRaises(ValueError, lambda: discrete_df(self.r, self.t, out=np.empty(3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
 
+import numpy as np
+import scipy.optimize as sco
+
 from PyCurve.bjork_christensen_augmented import BjorkChristensenAugmented
 from PyCurve.curve import Curve
 
@@ -75,6 +78,23 @@ class MyTestCase(unittest.TestCase):
         self.assertAlmostEqual(self.bjork_christensen.cdf_t(20), 0.9360566826197276989, 10)
         self.assertAlmostEqual(self.bjork_christensen.cdf_t(30), 0.8849827895489620966, 10)
 
+    def test_calibration_gradient(self) -> None:
+        t = np.array(self.curve_1.get_time)
+        rt = np.array(self.curve_1.get_rate)
+        x = np.array([1.6, -0.1, -2.0, -3.1, -0.2, 3.4])
+        sse, grad = self.bjork_christensen._calibration_func(x, t, rt)
+        numerical = sco.approx_fprime(x, lambda y: self.bjork_christensen._calibration_func(y, t, rt)[0], 1e-7)
+        self.assertTrue(np.allclose(grad, numerical, rtol=1e-4, atol=1e-4))
+
+    def test_instantaneous_forward(self) -> None:
+        t, h = np.linspace(0.1, 30, 60), 1e-5
+        numerical = ((t + h) * self.bjork_christensen.d_rate(t + h)
+                     - (t - h) * self.bjork_christensen.d_rate(t - h)) / (2 * h)
+        self.assertTrue(np.allclose(self.bjork_christensen.instantaneous_forward(t), numerical, rtol=0, atol=1e-8))
+        numerical = (self.bjork_christensen.instantaneous_forward(t + h)
+                     - self.bjork_christensen.instantaneous_forward(t - h)) / (2 * h)
+        self.assertTrue(np.allclose(self.bjork_christensen.instantaneous_forward_dt(t), numerical, rtol=0, atol=1e-8))
+
 
 if __name__ == '__main__':
     unittest.main()
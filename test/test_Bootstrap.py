@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+from PyCurve.bootstrap import Bootstrapper
+
+
+class TestBootstrap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.instruments = ([("deposit", 0.25), ("deposit", 0.5)] + [("fra", start, start + 0.5) for start in (0.5, 1.)]
+                            + [("swap", maturity) for maturity in (2, 3, 5, 7, 10, 15, 20, 30)])
+        self.quotes = np.array([1., 1.1, 1.25, 1.4, 1.5, 1.7, 2., 2.2, 2.4, 2.6, 2.7, 2.75])
+        self.bootstrapper = Bootstrapper(self.instruments)
+
+    def test_repricing(self) -> None:
+        result = self.bootstrapper.bootstrap(self.quotes)
+        self.assertTrue(result.success)
+        self.assertLess(np.abs(result.repricing_error).max(), 1e-10)
+        self.assertEqual(result.curve.get_time.tolist(), [0.25, 0.5, 1., 1.5, 2., 3., 5., 7., 10., 15., 20., 30.])
+        interpolator = result.interpolator()
+        self.assertAlmostEqual(100 * (1 / interpolator.df_t(0.25) - 1) / 0.25, 1.)
+        self.assertAlmostEqual(100 * (interpolator.df_t(1.) / interpolator.df_t(1.5) - 1) / 0.5, 1.4)
+        df = interpolator.df_t(np.arange(1., 11.))
+        self.assertAlmostEqual(100 * (1 - df[-1]) / df.sum(), 2.4)
+        self.assertAlmostEqual(result.interpolator("linear").d_rate(5.), result.curve.get_rate[6])
+
+    def test_input_order(self) -> None:
+        order = np.random.default_rng(0).permutation(len(self.instruments))
+        shuffled = Bootstrapper([self.instruments[i] for i in order]).bootstrap(self.quotes[order])
+        self.assertTrue(np.allclose(shuffled.curve.get_rate, self.bootstrapper.bootstrap(self.quotes).curve.get_rate))
+        semi_annual = Bootstrapper(self.instruments, frequency=2).bootstrap(self.quotes)
+        self.assertLess(np.abs(semi_annual.repricing_error).max(), 1e-10)
+
+    def test_invalid(self) -> None:
+        self.assertRaises(TypeError, lambda: Bootstrapper([("future", 1.)]))
+        self.assertRaises(ValueError, lambda: Bootstrapper([("deposit", 1.), ("swap", 1.)]))
+        self.assertRaises(ValueError, lambda: self.bootstrapper.bootstrap(self.quotes[:-1]))
+        quotes = self.quotes.copy()
+        quotes[-1] = 9.
+        self.assertRaises(np.linalg.LinAlgError, lambda: self.bootstrapper.bootstrap(quotes))
+
+
+if __name__ == '__main__':
+    unittest.main()
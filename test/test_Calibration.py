@@ -0,0 +1,147 @@
+import contextlib
+import io
+import unittest
+from multiprocessing import shared_memory
+
+import numpy as np
+import scipy.sparse as sp
+from PyCurve.bjork_christensen import BjorkChristensen
+from PyCurve.bjork_christensen_augmented import BjorkChristensenAugmented
+from PyCurve.calibration import _calibrate_shared_chunk, fit, global_candidates, population_sse
+from PyCurve.curve import Curve
+from PyCurve.nelson_siegel import NelsonSiegel
+from PyCurve.svensson_nelson_siegel import NelsonSiegelAugmented
+
+
+class TestCalibration(unittest.TestCase):
+    def setUp(self) -> None:
+        self.t = np.array([0.25, 0.5, 1., 2., 3., 5., 7., 10., 15., 20., 30.])
+        betas = np.array([1.5, -1., 0.5]) + np.linspace(0, 0.2, 20)[:, None]
+        self.rates = np.array([NelsonSiegel(*beta, 1.).d_rate(self.t) for beta in betas], dtype=np.float64)
+
+    def test_panel_layout(self) -> None:
+        results = NelsonSiegel.calibrate_panel(self.t, self.rates)
+        self.assertEqual(results.shape, (20,))
+        self.assertEqual(results["x"].shape, (20, 4))
+        self.assertTrue(results["success"].all())
+        self.assertLess(results["fun"].max(), 1e-6)
+
+    def test_panel_warm_start(self) -> None:
+        warm = NelsonSiegel.calibrate_panel(self.t, self.rates)
+        cold = NelsonSiegel.calibrate_panel(self.t, self.rates, warm_start=False)
+        self.assertLess(warm["nit"][1:].sum(), cold["nit"][1:].sum())
+
+    def test_panel_missing_quotes(self) -> None:
+        rates = self.rates.copy()
+        rates[3, 2] = np.nan
+        results = BjorkChristensen.calibrate_panel(self.t, rates)
+        self.assertTrue(np.isfinite(results["fun"]).all())
+        self.assertRaises(ValueError, lambda: NelsonSiegel.calibrate_panel(self.t, rates[:, :-1]))
+
+    def test_parallel_calibration(self) -> None:
+        serial = NelsonSiegel.calibrate_panel(self.t, self.rates, warm_start=False)
+        parallel = NelsonSiegel.calibrate_parallel(self.t, self.rates, warm_start=False, max_workers=2, chunk_size=7)
+        self.assertTrue((serial == parallel).all())
+        chunked = NelsonSiegel.calibrate_parallel(self.t, self.rates, max_workers=2, chunk_size=7)
+        self.assertTrue(np.allclose(chunked["x"], serial["x"], atol=1e-3))
+
+    def test_shared_chunk_error(self) -> None:
+        shm = shared_memory.SharedMemory(create=True, size=self.rates.nbytes)
+        try:
+            self.assertRaises(ValueError, lambda: _calibrate_shared_chunk(NelsonSiegel, shm.name, self.rates.shape,
+                                                                          self.t[1:], 0, 5, None, True))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_profile_calibration(self) -> None:
+        curve = Curve([0.25, 0.5, 0.75, 1., 2., 3., 4., 5., 6., 7., 8., 9., 10., 15., 20., 25., 30.],
+                      [-0.63171, -0.650322, -0.664493, -0.674608, -0.681294, -0.647593, -0.587828, -0.51251,
+                       -0.429238, -0.343399, -0.258716, -0.177665, -0.101804, 0.182851, 0.32962, 0.392117,
+                       0.412151])
+        local = NelsonSiegelAugmented(1, 2, 3, 4, 5, 6).calibrate(curve)
+        model = NelsonSiegelAugmented(1, 2, 3, 4, 5, 6)
+        profile = model.calibrate(curve, method="profile")
+        self.assertLess(profile.fun, local.fun)
+        self.assertEqual(model.get_attr("tau"), profile.x[4])
+        self.assertRaises(TypeError, lambda: model.calibrate(curve, method="newton"))
+
+    def test_population_sse(self) -> None:
+        population = np.array([[1.5, -1., 0.5, 1.], [1., 0., 0., 1.], [0.5, 2., -3., 7.]])
+        sse = population_sse(NelsonSiegel, population, self.t, self.rates[0])
+        expected = [NelsonSiegel._calibration_func(x, self.t, self.rates[0])[0] for x in population]
+        self.assertTrue(np.allclose(sse, expected))
+        self.assertAlmostEqual(sse[0], 0.)
+
+    def test_global_calibration(self) -> None:
+        curve = Curve([0.25, 0.5, 0.75, 1., 2., 3., 4., 5., 6., 7., 8., 9., 10., 15., 20., 25., 30.],
+                      [-0.63171, -0.650322, -0.664493, -0.674608, -0.681294, -0.647593, -0.587828, -0.51251,
+                       -0.429238, -0.343399, -0.258716, -0.177665, -0.101804, 0.182851, 0.32962, 0.392117,
+                       0.412151])
+        local = BjorkChristensenAugmented(1, 2, 3, 4, 5, 6).calibrate(curve)
+        first = BjorkChristensenAugmented(1, 2, 3, 4, 5, 6).calibrate(curve, method="global")
+        second = BjorkChristensenAugmented(1, 2, 3, 4, 5, 6).calibrate(curve, method="global")
+        self.assertLess(first.fun, local.fun)
+        self.assertEqual(first.x.tolist(), second.x.tolist())
+        self.assertGreater(first.grid_evaluations, 0)
+        self.assertIn("global", first.timings)
+
+    def test_global_not_worse_than_local(self) -> None:
+        t = np.array([0.25, 0.5, 0.75, 1., 2., 3., 4., 5., 6., 7., 8., 9., 10., 15., 20., 25., 30.])
+        rates = np.array([-0.63171, -0.650322, -0.664493, -0.674608, -0.681294, -0.647593, -0.587828, -0.51251,
+                          -0.429238, -0.343399, -0.258716, -0.177665, -0.101804, 0.182851, 0.32962, 0.392117,
+                          0.412151])
+        tenors = np.linspace(0.25, 30, 33)
+        wavy = np.interp(tenors, t, rates) + 0.05 * np.sin(tenors)
+        for model in (NelsonSiegel, NelsonSiegelAugmented, BjorkChristensen, BjorkChristensenAugmented):
+            for curve in (Curve(t, rates), Curve(tenors, wavy)):
+                local = fit(model, curve.get_time, curve.get_rate, "local")
+                global_ = fit(model, curve.get_time, curve.get_rate, "global")
+                self.assertLessEqual(global_.fun, local.fun)
+                self.assertGreaterEqual(global_.nfev, local.nfev)
+                self.assertGreaterEqual(global_.nit, local.nit)
+                candidates, _ = global_candidates(model, curve.get_time, curve.get_rate, seed=3)
+                self.assertEqual(candidates.shape, (3, len(model._boundaries)))
+
+    def test_calibration_report(self) -> None:
+        reports = []
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            report = NelsonSiegel(1, 2, 3, 4).calibrate(Curve(self.t, self.rates[0]), method="profile",
+                                                         callback=reports.append)
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertIs(reports[0], report)
+        self.assertEqual(report.method, "profile")
+        self.assertEqual(report.sse, report.fun)
+        self.assertAlmostEqual(report.rmse ** 2 * len(self.t), report.sse)
+        self.assertTrue(report.converged)
+        self.assertEqual(report.grid_evaluations, 60)
+        self.assertEqual(sorted(report.timings), ["grid", "optimize"])
+        self.assertGreaterEqual(report.wall_time, sum(report.timings.values()))
+        with contextlib.redirect_stdout(stdout):
+            NelsonSiegel(1, 2, 3, 4).calibrate(Curve(self.t, self.rates[0]), verbose=True)
+        self.assertIn("Calibration Results", stdout.getvalue())
+
+    def test_price_calibration(self) -> None:
+        t = np.arange(1, 61) / 2
+        cashflows = np.zeros((30, 60))
+        for bond, maturity in enumerate(range(2, 61, 2)):
+            cashflows[bond, :maturity] = 1.25
+            cashflows[bond, maturity - 1] += 100
+        prices = cashflows @ NelsonSiegel(3., -1.5, 1., 2.).df_t(t)
+        dense = NelsonSiegel(1, 0, 0, 1)
+        report = dense.calibrate_prices(cashflows, t, prices)
+        self.assertEqual(report.method, "price")
+        self.assertTrue(np.allclose(report.x, [3., -1.5, 1., 2.], atol=1e-4))
+        self.assertAlmostEqual(dense.get_attr("tau"), 2., places=4)
+        sparse = NelsonSiegel(1, 0, 0, 1).calibrate_prices(sp.csr_matrix(cashflows), t, prices, "duration")
+        self.assertTrue(np.allclose(sparse.x, [3., -1.5, 1., 2.], atol=1e-4))
+        prices = cashflows @ NelsonSiegel(3., -1.5, 1., 2.).cdf_t(t)
+        continuous = NelsonSiegel(1, 0, 0, 1).calibrate_prices(cashflows, t, prices, compounding="continuous")
+        self.assertTrue(np.allclose(continuous.x, [3., -1.5, 1., 2.], atol=1e-4))
+        self.assertRaises(ValueError, lambda: dense.calibrate_prices(cashflows[:, 1:], t, prices))
+        self.assertRaises(TypeError, lambda: dense.calibrate_prices(cashflows, t, prices, "convexity"))
+
+
+if __name__ == '__main__':
+    unittest.main()
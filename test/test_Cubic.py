@@ -30,7 +30,7 @@ class MyTestCase(unittest.TestCase):
 
     def test_curve(self) -> None:
         self.curve_2 = self.cub_curve.create_curve([0, 5, 10, 15, 20])
-        self.assertEqual(self.curve_2.get_time, self.curve_2.get_time)
+        self.assertEqual(self.curve_2.get_time.tolist(), [0, 5, 10, 15, 20])
         self.assertEqual(self.curve_2.get_rate[0], self.cub_curve.d_rate(self.curve_2.get_time[0]))
         self.assertEqual(self.curve_2.get_rate[2], self.cub_curve.d_rate(self.curve_2.get_time[2]))
         self.assertEqual(self.curve_2.get_rate[4], self.cub_curve.d_rate(self.curve_2.get_time[4]))
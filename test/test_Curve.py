@@ -9,22 +9,46 @@ class TestCurve(unittest.TestCase):
         self.curve_2 = Curve(np.array([0, 0, 0, 0]), np.array([0, 0, 0, 0]))
 
     def test_getter(self) -> None:
-        self.assertEqual(self.curve_1.get_time, [0, 0, 0, 0])
-        self.assertEqual(self.curve_1.get_rate, [0, 0, 0, 0])
+        self.assertEqual(self.curve_1.get_time.tolist(), [0, 0, 0, 0])
+        self.assertEqual(self.curve_1.get_rate.tolist(), [0, 0, 0, 0])
         self.assertTrue((self.curve_2.get_time == np.array([0, 0, 0, 0])).all())
         self.assertTrue((self.curve_2.get_rate == np.array([0, 0, 0, 0])).all())
 
     def test_setter(self) -> None:
         self.curve_1.set_time([0, 1, 2, 3])
         self.curve_1.set_rate([3, 2, 1, 0])
-        self.assertEqual(self.curve_1.get_time, [0, 1, 2, 3])
-        self.assertEqual(self.curve_1.get_rate, [3, 2, 1, 0])
+        self.assertEqual(self.curve_1.get_time.tolist(), [0, 1, 2, 3])
+        self.assertEqual(self.curve_1.get_rate.tolist(), [3, 2, 1, 0])
 
         self.curve_2.set_time(np.array([0, 1, 2, 3]))
         self.curve_2.set_rate(np.array([3, 2, 1, 0]))
         self.assertTrue((self.curve_2.get_time == np.array([0, 1, 2, 3])).all())
         self.assertTrue((self.curve_2.get_rate == np.array([3, 2, 1, 0])).all())
 
+    def test_validation(self) -> None:
+        self.assertEqual(self.curve_2.get_time.dtype, np.float64)
+        self.assertFalse(self.curve_2.get_rate.flags.writeable)
+        self.assertRaises(ValueError, lambda: Curve([1, 0], [0, 0]))
+        self.assertRaises(ValueError, lambda: Curve([0, 1], [0, np.nan]))
+        self.assertRaises(ValueError, lambda: Curve([0, 1], [0, 1, 2]))
+        self.assertRaises(ValueError, lambda: self.curve_2.set_rate([1, 2]))
+        self.assertRaises(TypeError, lambda: Curve([0, 1], [0, 1], "float16"))
+        self.assertEqual(Curve([0, 1], [0, 1], "float32").get_rate.dtype, np.float32)
+
+    def test_shared_views(self) -> None:
+        curve = Curve(np.arange(10.), np.linspace(1, 2, 10))
+        self.assertIs(Curve(curve.get_time, curve.get_rate).get_time, curve.get_time)
+        head = curve[2:6]
+        self.assertEqual(len(head), 4)
+        self.assertTrue(np.shares_memory(head.get_rate, curve.get_rate))
+        self.assertEqual(curve[[1, 3]].get_time.tolist(), [1., 3.])
+        self.assertEqual(curve[0].get_time.tolist(), [0.])
+        self.assertEqual(curve[-1].get_rate.tolist(), [2.])
+        self.assertTrue(np.shares_memory(curve[3].get_rate, curve.get_rate))
+        self.assertRaises(IndexError, lambda: curve[10])
+        self.assertRaises(ValueError, lambda: curve[::-1])
+        self.assertRaises(AttributeError, lambda: setattr(curve, "spread", 1))
+
 
 if __name__ == '__main__':
     unittest.main()
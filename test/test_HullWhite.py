@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+from PyCurve.curve import Curve
+from PyCurve.hull_white import HullWhite
+from PyCurve.simulation import Simulation
+
+
+class TestHullWhite(unittest.TestCase):
+    def setUp(self) -> None:
+        t = np.linspace(0, 6, 25)
+        self.forward = Curve(t, 0.5 + 0.1 * t - 0.002 * t ** 2)
+        self.hull_white = HullWhite(0.1, 0.01, 0.5, 5, 1 / 52, self.forward, "cubic")
+
+    def test_theta_table(self) -> None:
+        theta = self.hull_white.theta_table()
+        self.assertEqual(theta.shape, (self.hull_white.get_attr("_steps"),))
+        self.assertAlmostEqual(theta[10], self.hull_white._theta_part(10 / 52))
+        self.assertIs(self.hull_white.theta_table(), theta)
+        self.hull_white.set_attr("_alpha", 0.2)
+        self.assertIsNot(self.hull_white.theta_table(), theta)
+        theta = self.hull_white.theta_table()
+        self.forward.set_rate(self.forward.get_rate + 1)
+        self.assertTrue(np.allclose(self.hull_white.theta_table()[1:] - theta[1:], 0.2))
+        self.assertRaises(TypeError, lambda: self.hull_white.set_attr("_method", "spline"))
+
+    def test_log_discount_methods(self) -> None:
+        t, f = self.forward.get_time, self.forward.get_rate
+        knot_df = np.exp(-np.cumsum((f[1:] + f[:-1]) / 2 * np.diff(t)))
+        fine = np.linspace(0, 6, 6001)
+        for method in ("log_linear", "flat_forward", "monotone_convex"):
+            hull_white = HullWhite(0.1, 0.01, 0.5, 5, 1 / 52, self.forward, method)
+            self.assertTrue(np.allclose(hull_white._forward_interpolator().df_t(t[1:]), knot_df, rtol=0, atol=1e-10))
+            forward = hull_white._interp_forward(fine)
+            self.assertTrue(np.allclose(forward, 0.5 + 0.1 * fine - 0.002 * fine ** 2, atol=0.02))
+            if method != "monotone_convex":
+                middle = hull_white._interp_forward((t[1:] + t[:-1]) / 2)
+                self.assertTrue(np.allclose(middle, (f[1:] + f[:-1]) / 2, rtol=0, atol=1e-10))
+
+    def test_reseed(self) -> None:
+        hull_white = HullWhite(0.1, 0.01, 0.5, 5, 1 / 52, self.forward, "cubic", seed=1)
+        hull_white.simulate_paths(4)
+        hull_white.set_attr("_seed", 5)
+        fresh = HullWhite(0.1, 0.01, 0.5, 5, 1 / 52, self.forward, "cubic", seed=5)
+        self.assertTrue(np.array_equal(hull_white.simulate_paths(4).get_sim, fresh.simulate_paths(4).get_sim))
+        self.assertTrue(np.array_equal([child.generate_state(4) for child in hull_white.spawn_seeds(2)],
+                                       [child.generate_state(4) for child in fresh.spawn_seeds(2)]))
+
+    def test_simulation_drift(self) -> None:
+        simulation = HullWhite(0.1, 0.01, 0.5, 5, 1 / 52, self.forward, "cubic", seed=0).simulate_paths(3).get_sim
+        hull_white = HullWhite(0.1, 0.01, 0.5, 5, 1 / 52, self.forward, "cubic", seed=0)
+        rt = np.full(3, 0.5)
+        for i in range(1, 5):
+            rt = rt + hull_white._mu_dt(rt, i / 52) + hull_white._sigma_part(3)
+        self.assertTrue(np.allclose(simulation[4], rt))
+
+    def test_exact_scheme(self) -> None:
+        hull_white = HullWhite(0.3, 0.01, 0.5, 5, 1 / 12, self.forward, "cubic", seed=4)
+        phi, integral = hull_white.phi_table()
+        self.assertEqual(phi[0], hull_white._interp_forward(0.))
+        aggregate = hull_white.simulate_stream(20000, 5000, scheme="exact")
+        t = aggregate.get_time
+        fine = np.linspace(0, 5, 6001)
+        forward = hull_white._interp_forward(fine)
+        initial = np.exp(-np.interp(t, fine, np.concatenate([[0.], np.cumsum((forward[1:] + forward[:-1]) / 2)
+                                                             * (fine[1] - fine[0])])))
+        error = np.sqrt(aggregate.discount_variance() / aggregate.get_nb_sim)
+        self.assertLess(np.abs((aggregate.discount_factor() - initial) / error).max(), 4)
+        self.assertTrue(np.allclose(integral[:-1], (phi[:-1] + phi[1:]) / 2 / 12, rtol=1e-4))
+
+    def test_control_variate(self) -> None:
+        hull_white = HullWhite(0.3, 0.01, 0.5, 5, 1 / 12, self.forward, "cubic", seed=6)
+        price = hull_white.zero_coupon_price()
+        fine = np.linspace(0, 5, 6001)
+        forward = hull_white._interp_forward(fine)
+        initial = np.exp(-np.interp(hull_white.simulate_paths(2).get_time, fine, np.concatenate(
+            [[0.], np.cumsum((forward[1:] + forward[:-1]) / 2) * (fine[1] - fine[0])])))
+        self.assertTrue(np.allclose(price, initial, rtol=1e-6))
+        simulation = hull_white.simulate_paths(1000, scheme="exact", control_variate=True)
+        self.assertTrue(np.allclose(simulation.get_control_mean, price))
+        plain = Simulation(simulation.get_sim, simulation.get_dt, simulation.get_integrated).aggregate()
+        error = simulation.discount_standard_error()
+        self.assertTrue((error[12:] < plain.discount_standard_error()[12:] / 10).all())
+        self.assertLess(np.abs((simulation.aggregate().discount_factor() - price) / error).max(), 5)
+        self.assertTrue(np.allclose(simulation.yield_curve().get_rate,
+                                    price ** (-1 / simulation.get_time) - 1, atol=1e-4))
+
+
+if __name__ == '__main__':
+    unittest.main()
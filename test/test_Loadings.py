@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+from PyCurve.bjork_christensen import BjorkChristensen
+from PyCurve.loadings import LoadingCache, decay_loadings, loading_cache
+from PyCurve.nelson_siegel import NelsonSiegel
+
+
+class TestLoadings(unittest.TestCase):
+    def setUp(self) -> None:
+        self.t = np.linspace(0.25, 30, 120)
+        loading_cache.clear()
+
+    def test_decay_loadings(self) -> None:
+        slope, curvature = decay_loadings(np.array([0., 1e-10, 2.]), 2.)
+        self.assertTrue(np.allclose(slope, [1., 1., 1 - np.exp(-1)]))
+        self.assertTrue(np.allclose(curvature, [0., 0., 1 - 2 * np.exp(-1)]))
+        self.assertEqual(decay_loadings(self.t, 2., "float32")[0].dtype, np.float32)
+
+    def test_shared_cache(self) -> None:
+        first = NelsonSiegel(1, 2, 3, 4)
+        second = NelsonSiegel(0.5, -1, 2, 4)
+        rates = first.d_rate(self.t)
+        self.assertEqual(loading_cache.cache_info()["misses"], 1)
+        second.d_rate(self.t)
+        self.assertEqual(first.d_rate(self.t.copy()).tolist(), rates.tolist())
+        self.assertEqual(loading_cache.cache_info()["hits"], 2)
+        BjorkChristensen(1, 2, 3, 4, 4).d_rate(self.t)
+        first.set_attr("tau", 3)
+        first.d_rate(self.t)
+        self.assertEqual(loading_cache.cache_info()["misses"], 3)
+        self.assertFalse(first._loading_matrix(self.t).flags.writeable)
+
+    def test_bounded_cache(self) -> None:
+        cache = LoadingCache(maxsize=2)
+        for tau in (1., 2., 3.):
+            cache.get(NelsonSiegel, (tau,), "float64", self.t, lambda: NelsonSiegel._loadings(self.t, tau))
+        self.assertEqual(cache.cache_info()["size"], 2)
+        cache.get(NelsonSiegel, (1.,), "float64", self.t, lambda: NelsonSiegel._loadings(self.t, 1.))
+        self.assertEqual(cache.cache_info()["misses"], 4)
+        small = LoadingCache(max_bytes=1000)
+        small.get(NelsonSiegel, (1.,), "float64", self.t, lambda: NelsonSiegel._loadings(self.t, 1.))
+        self.assertEqual(small.cache_info()["size"], 0)
+
+    def test_cache_bypass(self) -> None:
+        model = NelsonSiegel(1, 2, 3, 4)
+        large = np.linspace(0.25, 30, 20000)
+        self.assertEqual(model.d_rate(large).shape, (20000,))
+        self.assertEqual(loading_cache.cache_info()["size"], 0)
+        self.assertEqual(loading_cache.cache_info()["bypassed"], 1)
+        with loading_cache.bypass():
+            inside = model.d_rate(self.t)
+        self.assertEqual(loading_cache.cache_info()["size"], 0)
+        self.assertEqual(loading_cache.cache_info()["bypassed"], 2)
+        self.assertEqual(model.d_rate(self.t).tolist(), inside.tolist())
+        self.assertEqual(loading_cache.cache_info()["size"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
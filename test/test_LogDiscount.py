@@ -0,0 +1,48 @@
+import unittest
+
+import numpy as np
+from PyCurve.curve import Curve
+from PyCurve.hull_white import HullWhite
+from PyCurve.log_discount import LogDiscountCurve
+
+
+class TestLogDiscount(unittest.TestCase):
+    def setUp(self) -> None:
+        self.t = np.array([0.25, 0.5, 1., 2., 3., 5., 7., 10., 15., 20., 30.])
+        self.rt = np.array([-0.6, -0.62, -0.65, -0.6, -0.5, -0.3, -0.1, 0.1, 0.3, 0.4, 0.45])
+        self.curve = Curve(self.t, self.rt)
+
+    def test_reprices_knots(self) -> None:
+        for method in ("log_linear", "flat_forward", "monotone_convex"):
+            interpolator = LogDiscountCurve(self.curve, method)
+            self.assertTrue(np.allclose(interpolator.d_rate(self.t), self.rt, atol=1e-12))
+            self.assertTrue(np.allclose(interpolator.df_t(self.t), (1 + self.rt / 100) ** -self.t))
+        self.assertRaises(TypeError, lambda: LogDiscountCurve(self.curve, "spline"))
+        self.assertRaises(ValueError, lambda: LogDiscountCurve(Curve([1., 0.5], [1., 1.])))
+
+    def test_log_linear(self) -> None:
+        interpolator = LogDiscountCurve(self.curve, "log_linear")
+        log_df = np.log(interpolator.df_t([2., 2.5, 3.]))
+        self.assertAlmostEqual(log_df[1], (log_df[0] + log_df[2]) / 2)
+        forward = interpolator.instantaneous_forward([2.2, 2.8])
+        self.assertAlmostEqual(forward[0], forward[1])
+        self.assertAlmostEqual(interpolator.d_rate(0.), -0.6)
+
+    def test_monotone_convex(self) -> None:
+        interpolator = LogDiscountCurve(self.curve)
+        grid = np.linspace(0, 35, 70001)
+        forward = interpolator.instantaneous_forward(grid) / 100
+        self.assertLess(np.abs(np.diff(forward)).max(), 1e-4)
+        integral = np.concatenate([[0], np.cumsum((forward[1:] + forward[:-1]) / 2 * np.diff(grid))])
+        self.assertTrue(np.allclose(np.log(interpolator.df_t(grid)), -integral, atol=1e-8))
+        positive = LogDiscountCurve(Curve(self.t, np.array([0.05, 3., 1.6, 1.2, 2., 2.5, 3., 3.1, 3.2, 3.3, 3.4])))
+        self.assertGreaterEqual(positive.instantaneous_forward(grid).min(), 0)
+        self.assertEqual(interpolator.d_rate(np.ones((2, 3))).shape, (2, 3))
+
+    def test_hull_white_method(self) -> None:
+        hull_white = HullWhite(0.1, 0.01, 0.5, 5, 1 / 52, self.curve, "monotone_convex")
+        self.assertTrue(np.isfinite(hull_white.theta_table()).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
 
+import numpy as np
+import scipy.optimize as sco
+
 from PyCurve.curve import Curve
 from PyCurve.nelson_siegel import NelsonSiegel
 from PyCurve.svensson_nelson_siegel import NelsonSiegelAugmented
@@ -124,6 +127,45 @@ class Test_ns_nss(unittest.TestCase):
         self.assertAlmostEqual(self.ns.cdf_t(20), 0.9405866976387468649, 10)
         self.assertAlmostEqual(self.ns.cdf_t(30), 0.8719846015741027802, 10)
 
+    def test_calibration_gradient(self) -> None:
+        t = np.array(self.curve_1.get_time)
+        rt = np.array(self.curve_1.get_rate)
+        for model, x in ((self.ns, np.array([0.8, -1.3, -2.3, 2.5])),
+                         (self.nss, np.array([0.8, -1.3, -1.4, -0.9, 2.5, 4.0]))):
+            sse, grad = model._calibration_func(x, t, rt)
+            numerical = sco.approx_fprime(x, lambda y: model._calibration_func(y, t, rt)[0], 1e-7)
+            self.assertTrue(np.allclose(grad, numerical, rtol=1e-4, atol=1e-4))
+
+    def test_precision(self) -> None:
+        t = np.linspace(0, 30, 301)
+        reference = NelsonSiegel(1, 2, 3, 4, precision="longdouble").d_rate(t)
+        self.assertEqual(reference.dtype, np.longdouble)
+        self.assertEqual(self.ns.d_rate(t).dtype, np.float64)
+        self.assertTrue(np.allclose(self.ns.d_rate(t), reference, rtol=0, atol=1e-14))
+        self.ns.set_attr("precision", "float32")
+        self.assertEqual(self.ns.d_rate(t).dtype, np.float32)
+        self.assertTrue(np.allclose(self.ns.d_rate(t), reference, rtol=0, atol=1e-5))
+        self.assertRaises(TypeError, lambda: self.ns.set_attr("precision", "float16"))
+        self.assertRaises(TypeError, lambda: NelsonSiegelAugmented(1, 2, 3, 4, 5, 6, precision="half"))
+
+    def test_short_end_limit(self) -> None:
+        self.assertAlmostEqual(self.ns.d_rate(0.0), 3.0, 14)
+        self.assertAlmostEqual(self.nss.d_rate(0.0), 3.0, 14)
+        self.assertAlmostEqual(float(self.ns.d_rate(1e-12)), 3.0, 10)
+        self.assertTrue(np.isfinite(self.nss.d_rate(np.linspace(0, 50, 1000))).all())
+
+    def test_instantaneous_forward(self) -> None:
+        t, h = np.linspace(0.1, 30, 60), 1e-5
+        for model in (self.ns, self.nss):
+            numerical = ((t + h) * model.d_rate(t + h) - (t - h) * model.d_rate(t - h)) / (2 * h)
+            self.assertTrue(np.allclose(model.instantaneous_forward(t), numerical, rtol=0, atol=1e-8))
+            numerical = (model.instantaneous_forward(t + h) - model.instantaneous_forward(t - h)) / (2 * h)
+            self.assertTrue(np.allclose(model.instantaneous_forward_dt(t), numerical, rtol=0, atol=1e-8))
+            self.assertAlmostEqual(float(model.instantaneous_forward(0.)), float(model.d_rate(0.)), 14)
+            curve = model.forward_curve(t)
+            self.assertEqual(curve.get_time.tolist(), t.tolist())
+            self.assertTrue(np.array_equal(curve.get_rate, model.instantaneous_forward(t)))
+
 
 if __name__ == '__main__':
     unittest.main()
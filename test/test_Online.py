@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import scipy.optimize as sco
+from PyCurve.curve import Curve
+from PyCurve.nelson_siegel import NelsonSiegel
+from PyCurve.online import OnlineCalibrator
+from PyCurve.svensson_nelson_siegel import NelsonSiegelAugmented
+
+
+class TestOnline(unittest.TestCase):
+    def setUp(self) -> None:
+        self.t = np.linspace(0.25, 30, 20)
+        self.rates = NelsonSiegelAugmented(3., -1.5, 1., 0.5, 2., 5.).d_rate(self.t)
+
+    def test_warm_started_update(self) -> None:
+        model = NelsonSiegelAugmented(3., -1.5, 1., 0.5, 2., 5.)
+        online = OnlineCalibrator(model, Curve(self.t, self.rates.copy()))
+        rng = np.random.default_rng(0)
+        for i in rng.integers(0, 20, 200):
+            x = online.update(self.t[i], online.get_rate[i] + rng.normal(0, 0.01))
+        self.assertEqual(model.get_attr("tau2"), x[5])
+        full = NelsonSiegelAugmented(3., -1.5, 1., 0.5, 2., 5.).calibrate(Curve(self.t, online.get_rate.copy()))
+        self.assertLess(online.sse(), full.fun * 1.01)
+        self.assertEqual(online.latency_info()["count"], 200)
+
+    def test_fixed_taus_update(self) -> None:
+        model = NelsonSiegel(1., 0., 0., 2.)
+        online = OnlineCalibrator(model, Curve(self.t, self.rates.copy()), fixed_taus=True)
+        online.update(self.t[4], 1.2)
+        online.update(self.t[11], 2.1)
+        loadings = NelsonSiegel._loadings(self.t, 2.)
+        betas = np.linalg.lstsq(loadings, online.get_rate, rcond=None)[0]
+        self.assertTrue(np.allclose(online.get_params[:3], betas))
+        self.assertEqual(model.get_attr("tau"), 2.)
+        self.assertRaises(ValueError, lambda: online.update(4.2, 1.))
+        self.assertRaises(ValueError, lambda: online.set_attr("iterations", 0))
+
+    def test_fixed_taus_bounds(self) -> None:
+        model = NelsonSiegel(0.3, -0.5, 0.2, 2.0)
+        quotes = model.d_rate(self.t)
+        online = OnlineCalibrator(model, Curve(self.t, quotes.copy()), fixed_taus=True)
+        for i, tenor in enumerate(self.t):
+            x = online.update(tenor, quotes[i] - 1.)
+            self.assertTrue(np.array_equal(x, [model.get_attr(attr) for attr in model.attr_list]))
+            self.assertGreaterEqual(x[0], NelsonSiegel._boundaries[0][0])
+            self.assertEqual(x[3], 2.0)
+        self.assertTrue(np.array_equal(online.get_rate, quotes - 1.))
+        loadings = NelsonSiegel._loadings(self.t, 2.0)
+        self.assertLess(np.linalg.lstsq(loadings, online.get_rate, rcond=None)[0][0], 0)
+        bounds = np.array(NelsonSiegel._boundaries[:3]).T
+        betas = sco.lsq_linear(loadings, online.get_rate, bounds=(bounds[0], bounds[1])).x
+        self.assertTrue(np.allclose(x[:3], betas))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PyCurve.bjork_christensen import BjorkChristensen
+from PyCurve.bjork_christensen_augmented import BjorkChristensenAugmented
+from PyCurve.nelson_siegel import NelsonSiegel
+from PyCurve.panel import CurvePanel
+from PyCurve.store import CurveStore
+from PyCurve.svensson_nelson_siegel import NelsonSiegelAugmented
+
+
+class TestPanel(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rng = np.random.default_rng(0)
+        self.t = np.linspace(0, 30, 61)
+        self.dates = np.arange("2024-01-01", "2024-02-20", dtype="datetime64[D]")
+
+    def _params(self, n_params: int) -> np.ndarray:
+        return np.abs(self.rng.normal(1, 0.5, (self.dates.shape[0], n_params))) + 0.1
+
+    def test_matches_models(self) -> None:
+        for model, n_params in ((NelsonSiegel, 4), (NelsonSiegelAugmented, 6), (BjorkChristensen, 5),
+                                (BjorkChristensenAugmented, 6)):
+            params = self._params(n_params)
+            panel = CurvePanel(model, params, self.dates)
+            instances = [model(*x) for x in params]
+            self.assertTrue(np.allclose(panel.d_rate(self.t), [m.d_rate(self.t) for m in instances], atol=1e-13))
+            self.assertTrue(np.allclose(panel.df_t(self.t), [m.df_t(self.t) for m in instances], atol=1e-13))
+            self.assertTrue(np.allclose(panel.cdf_t(self.t), [m.cdf_t(self.t) for m in instances], atol=1e-13))
+            self.assertTrue(np.allclose(panel.forward_rate(1., self.t[3:]),
+                                        [m.forward_rate(1., self.t[3:]) for m in instances], atol=1e-12))
+            self.assertTrue(np.allclose(panel.instantaneous_forward(self.t),
+                                        [m.instantaneous_forward(self.t) for m in instances], atol=1e-13))
+            self.assertEqual(panel.d_rate(5.).shape, (len(panel),))
+            self.assertEqual(panel.model(7).d_rate(5.), instances[7].d_rate(5.))
+
+    def test_slicing(self) -> None:
+        params = self._params(4)
+        panel = CurvePanel(NelsonSiegel(1, 2, 3, 4), params, self.dates)
+        window = panel.between("2024-01-10", "2024-01-19")
+        self.assertEqual(len(window), 10)
+        self.assertTrue(np.array_equal(window.dates, self.dates[9:19]))
+        self.assertTrue(np.shares_memory(window.get_attr("_betas"), panel.get_attr("_betas")))
+        self.assertTrue(np.array_equal(window.d_rate(self.t), panel.d_rate(self.t)[9:19]))
+        self.assertTrue(np.array_equal(panel[-1].get_params, params[-1:]))
+        self.assertRaises(ValueError, lambda: CurvePanel(NelsonSiegel, params[:, :3]))
+        self.assertRaises(ValueError, lambda: CurvePanel(NelsonSiegel, params, self.dates[::-1]))
+        self.assertRaises(ValueError, lambda: CurvePanel(NelsonSiegel, params).between("2024-01-10"))
+
+    def test_sources(self) -> None:
+        params = self._params(4)
+        records = np.zeros(params.shape[0], dtype=[("x", np.float64, (4,)), ("fun", np.float64)])
+        records["x"] = params
+        self.assertTrue(np.array_equal(CurvePanel(NelsonSiegel, records).get_params, params))
+        with tempfile.TemporaryDirectory() as directory:
+            store = CurveStore(os.path.join(directory, "ns"), model=NelsonSiegel(1, 2, 3, 4))
+            store.extend(self.dates, params)
+            panel = CurvePanel.from_store(store, start="2024-02-01")
+            self.assertTrue(np.array_equal(panel.get_params, params[31:]))
+            self.assertTrue(np.array_equal(panel.dates, self.dates[31:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+from PyCurve.curve import Curve
+from PyCurve.linear import LinearCurve
+from PyCurve.nelson_siegel import NelsonSiegel
+from PyCurve.sensitivity import SensitivityEngine, key_rate_bumps, twist_bump
+
+
+class TestSensitivity(unittest.TestCase):
+    def setUp(self) -> None:
+        self.curve = Curve([0.25, 0.5, 1., 2., 3., 5., 7., 10., 15., 20., 30.],
+                           [-0.6, -0.62, -0.65, -0.6, -0.5, -0.3, -0.1, 0.1, 0.3, 0.4, 0.45])
+        self.t = np.arange(1, 21) / 2
+        self.cashflows = np.zeros((3, 20))
+        for bond, maturity in enumerate((4, 10, 20)):
+            self.cashflows[bond, :maturity] = 1.
+            self.cashflows[bond, maturity - 1] += 100
+
+    def test_bumps(self) -> None:
+        bumps = key_rate_bumps(self.t, [1., 2., 5.])
+        self.assertTrue(np.allclose(bumps.sum(axis=0), 0.01))
+        self.assertEqual(bumps[1, 3], 0.01)
+        self.assertAlmostEqual(bumps[2, 4], 0.01 / 6)
+        self.assertEqual(twist_bump(self.t, 2., 6.)[0, [0, 7, 15]].tolist(), [-0.005, 0., 0.005])
+        self.assertRaises(ValueError, lambda: key_rate_bumps(self.t, [2., 1.]))
+
+    def test_dv01(self) -> None:
+        engine = SensitivityEngine(LinearCurve(self.curve), self.t)
+        dv01 = engine.dv01(self.cashflows)
+        shifted = [LinearCurve(Curve(self.curve.get_time, self.curve.get_rate + shift)) for shift in (0.01, -0.01)]
+        up, down = (self.cashflows @ curve.df_t(self.t) for curve in shifted)
+        self.assertTrue(np.allclose(dv01, (down - up) / 2))
+        self.assertAlmostEqual(engine.dv01(self.cashflows[1]), dv01[1])
+        key_rates = engine.key_rate_dv01(sp.csr_matrix(self.cashflows), [1., 2., 5., 10.])
+        self.assertEqual(key_rates.shape, (3, 4))
+        self.assertTrue(np.allclose(key_rates.sum(axis=1), dv01, rtol=1e-6))
+        self.assertTrue(np.allclose(key_rates[0, 2:], 0))
+
+    def test_key_rate_durations(self) -> None:
+        engine = SensitivityEngine(NelsonSiegel(3., -1.5, 1., 2.), self.t, "continuous")
+        zero_coupon = np.zeros(20)
+        zero_coupon[9] = 100
+        durations = engine.key_rate_durations(zero_coupon, [1., 5., 10.])
+        self.assertAlmostEqual(durations.sum(), 5., places=5)
+        self.assertRaises(ValueError, lambda: engine.dv01(np.ones(5)))
+        self.assertRaises(TypeError, lambda: SensitivityEngine(LinearCurve(self.curve), self.t, "simple"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 import unittest
+import warnings
 
 import numpy as np
-from PyCurve.simulation import Simulation
+from PyCurve.simulation import Simulation, SimulationAggregate, _brownian_bridge, chunk_sizes, standard_normals
 
 
 class MyTestCase(unittest.TestCase):
@@ -48,6 +49,66 @@ class MyTestCase(unittest.TestCase):
                                               [1.23409804e-04, 1.23409804e-04, 1.23409804e-04, 1.23409804e-04]]), 7),
                            equal_nan=False))
 
+    def test_average_discount(self) -> None:
+        paths = np.random.default_rng(0).normal(0.02, 0.01, (50, 300))
+        sim = Simulation(paths, 0.1)
+        self.assertTrue(np.allclose(sim.discount_factor(), np.exp(-0.1 * np.cumsum(paths, axis=0)), rtol=1e-14))
+        expected = sim.discount_factor().mean(axis=1)
+        self.assertTrue(np.allclose(sim.discount_factor(average=True, block_size=1000), expected, rtol=1e-14))
+        self.assertIs(sim.discount_factor(average=True), sim.discount_factor(average=True))
+        self.assertTrue(np.allclose(sim.yield_curve().get_rate, expected ** (-1 / sim.get_time) - 1, rtol=1e-12))
+
+    def test_aggregate(self) -> None:
+        paths = np.random.default_rng(1).normal(0.02, 0.01, (40, 250))
+        full = Simulation(paths, 0.25)
+        aggregate = SimulationAggregate.from_chunks(Simulation(paths[:, i:i + 60], 0.25) for i in range(0, 250, 60))
+        self.assertEqual(aggregate.get_nb_sim, 250)
+        self.assertTrue(np.allclose(aggregate.mean_rate(), paths.mean(axis=1), rtol=1e-13))
+        self.assertTrue(np.allclose(aggregate.rate_variance(), paths.var(axis=1, ddof=1), rtol=1e-10))
+        self.assertTrue(np.allclose(aggregate.discount_factor(), full.discount_factor(average=True), rtol=1e-13))
+        self.assertTrue(np.allclose(aggregate.discount_variance(), full.discount_factor().var(axis=1, ddof=1),
+                                    rtol=1e-10))
+        self.assertTrue(np.allclose(aggregate.yield_curve().get_rate, full.yield_curve().get_rate, rtol=1e-12))
+        first, second = SimulationAggregate(40, 0.25), SimulationAggregate(40, 0.25)
+        first.update(Simulation(paths[:, :100], 0.25))
+        second.update(Simulation(paths[:, 100:], 0.25))
+        first.merge(second)
+        self.assertTrue(np.allclose(first.rate_variance(), aggregate.rate_variance(), rtol=1e-10))
+        self.assertRaises(ValueError, lambda: first.update(Simulation(paths[:10], 0.25)))
+        self.assertEqual(chunk_sizes(25, 10), [10, 10, 5])
+        self.assertRaises(ValueError, lambda: chunk_sizes(0, 10))
+
+    def test_standard_normals(self) -> None:
+        shocks, residuals = standard_normals(6, 10, "antithetic", factors=2, rng=np.random.default_rng(2))
+        self.assertEqual(shocks.shape, (6, 10))
+        self.assertTrue(np.array_equal(shocks[:, :5], -shocks[:, 5:]))
+        self.assertTrue(np.array_equal(residuals[:, :5], -residuals[:, 5:]))
+        self.assertRaises(ValueError, lambda: standard_normals(6, 9, "antithetic"))
+        self.assertRaises(TypeError, lambda: standard_normals(6, 8, "halton"))
+        normals = np.random.default_rng(3).normal(size=(7, 4))
+        increments = _brownian_bridge(normals.copy())
+        self.assertTrue(np.allclose(increments.sum(axis=0), np.sqrt(7) * normals[0]))
+        sobol = standard_normals(16, 4096, "sobol")[0]
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(standard_normals(16, 1000, "sobol", rng=np.random.default_rng(5))[0].shape, (16, 1000))
+        self.assertTrue(np.allclose(sobol.mean(axis=1), 0, atol=0.05))
+        self.assertTrue(np.allclose(sobol.var(axis=1), 1, atol=0.1))
+
+    def test_sample_units(self) -> None:
+        paths = np.random.default_rng(4).normal(0.02, 0.01, (20, 100))
+        antithetic = Simulation(paths, 0.25, sampling="antithetic").aggregate()
+        self.assertEqual((antithetic.get_nb_sim, antithetic.get_nb_samples), (100, 50))
+        discount = Simulation(paths, 0.25).discount_factor()
+        pairs = (discount[:, :50] + discount[:, 50:]) / 2
+        self.assertTrue(np.allclose(antithetic.discount_factor(), discount.mean(axis=1), rtol=1e-13))
+        self.assertTrue(np.allclose(antithetic.discount_standard_error(), pairs.std(axis=1, ddof=1) / np.sqrt(50)))
+        replicates = SimulationAggregate.from_chunks(Simulation(paths[:, i:i + 25], 0.25, sampling="sobol")
+                                                     for i in range(0, 100, 25))
+        self.assertEqual(replicates.get_nb_samples, 4)
+        self.assertTrue(np.isnan(Simulation(paths, 0.25, sampling="sobol").discount_standard_error()).all())
+        self.assertRaises(ValueError, lambda: antithetic.merge(replicates))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PyCurve.curve import Curve
+from PyCurve.nelson_siegel import NelsonSiegel
+from PyCurve.store import CurveStore
+
+
+class TestStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "curves")
+        self.tenors = [0.5, 1., 2., 5., 10.]
+        self.dates = np.arange("2024-01-01", "2024-03-01", dtype="datetime64[D]")
+        self.values = np.random.default_rng(0).normal(1, 0.5, (self.dates.shape[0], 5))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_curve_round_trip(self) -> None:
+        store = CurveStore(self.path, tenors=self.tenors)
+        self.assertEqual(len(store), 0)
+        store.extend(self.dates[:-1], self.values[:-1])
+        store.append(self.dates[-1], Curve(self.tenors, self.values[-1]))
+        reopened = CurveStore(self.path)
+        self.assertEqual(len(reopened), self.dates.shape[0])
+        self.assertEqual(reopened.columns, self.tenors)
+        self.assertTrue(np.array_equal(reopened.dates, self.dates))
+        curve = reopened.curve("2024-02-10")
+        self.assertEqual(curve.get_time.tolist(), self.tenors)
+        self.assertEqual(curve.get_rate.tolist(), self.values[40].tolist())
+        self.assertIsInstance(reopened.column(5., "2024-01-10", "2024-01-20"), np.memmap)
+        self.assertEqual(reopened.column(5., "2024-01-10", "2024-01-20").tolist(), self.values[9:20, 3].tolist())
+        dates, values = reopened.panel(start="2024-02-20")
+        self.assertTrue(np.array_equal(dates, self.dates[50:]))
+        self.assertTrue(np.array_equal(values, self.values[50:]))
+        self.assertRaises(ValueError, lambda: reopened.curve("2023-12-31"))
+        self.assertRaises(ValueError, lambda: reopened.column(3.))
+
+    def test_append_checks(self) -> None:
+        store = CurveStore(self.path, tenors=self.tenors)
+        store.extend(self.dates, self.values)
+        self.assertRaises(ValueError, lambda: store.append("2024-01-15", self.values[0]))
+        self.assertRaises(ValueError, lambda: store.append("2024-03-01", Curve([1., 2.], [1., 1.])))
+        self.assertRaises(ValueError, lambda: store.append("2024-03-01", [1., np.nan, 1., 1., 1.]))
+        self.assertRaises(ValueError, lambda: CurveStore(self.path, tenors=self.tenors))
+        self.assertEqual(len(CurveStore(self.path)), self.dates.shape[0])
+
+    def test_model_round_trip(self) -> None:
+        path = os.path.join(self.directory.name, "nelson_siegel")
+        store = CurveStore(path, model=NelsonSiegel(1, 2, 3, 4))
+        store.append("2024-01-02", NelsonSiegel(1, 2, 3, 4))
+        store.append("2024-01-03", [1.5, -1, 2, 3])
+        model = CurveStore(path).model("2024-01-03")
+        self.assertIsInstance(model, NelsonSiegel)
+        self.assertEqual([model.get_attr(attr) for attr in model.attr_list], [1.5, -1, 2, 3])
+        self.assertEqual(store.column("tau").tolist(), [4, 3])
+        self.assertRaises(TypeError, lambda: store.curve("2024-01-02"))
+
+
+if __name__ == '__main__':
+    unittest.main()
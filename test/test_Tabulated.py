@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+from PyCurve.curve import Curve
+from PyCurve.linear import LinearCurve
+from PyCurve.nelson_siegel import NelsonSiegel
+from PyCurve.tabulated import TabulatedCurve
+
+
+class TestTabulated(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = NelsonSiegel(3., -1.5, 1., 2.)
+        self.tabulated = TabulatedCurve(self.model, t_max=30., step=0.01)
+
+    def test_lookup(self) -> None:
+        t = np.random.default_rng(0).uniform(0, 30, 1000)
+        self.assertTrue(np.allclose(self.tabulated.d_rate(t), self.model.d_rate(t), atol=1e-5))
+        self.assertTrue(np.allclose(self.tabulated.df_t(t), self.model.df_t(t), atol=1e-7))
+        self.assertEqual(self.tabulated.d_rate(5.), self.model.d_rate(np.array([5.]))[0])
+        self.assertEqual(self.tabulated.df_t(30.), self.model.df_t(np.array([30.]))[0])
+        self.assertRaises(ValueError, lambda: self.tabulated.d_rate([10., 31.]))
+
+    def test_error_estimate(self) -> None:
+        error = self.tabulated.max_error()
+        bound = self.tabulated.error_bound
+        self.assertLess(error["rate"], 1e-5)
+        self.assertAlmostEqual(error["rate"], bound["rate"], delta=0.05 * bound["rate"])
+        self.assertAlmostEqual(error["df"], bound["df"], delta=0.05 * bound["df"])
+        coarse = TabulatedCurve(self.model, t_max=30., step=0.1)
+        self.assertGreater(coarse.max_error()["rate"], 50 * error["rate"])
+
+    def test_interpolator(self) -> None:
+        linear = LinearCurve(Curve([0.5, 1., 5., 10.], [1., 1.2, 2., 2.5]))
+        tabulated = TabulatedCurve(linear, t_min=0.5, t_max=10., step=0.25)
+        self.assertAlmostEqual(tabulated.d_rate(3.3), linear.d_rate(3.3))
+        self.assertAlmostEqual(tabulated.max_error()["rate"], 0)
+        self.assertRaises(ValueError, lambda: TabulatedCurve(linear, t_min=10., t_max=0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
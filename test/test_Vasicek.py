@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from PyCurve.vasicek import Vasicek
 from PyCurve.linear import LinearCurve
 
@@ -42,6 +44,88 @@ class MyTestCase(unittest.TestCase):
         self.assertAlmostEqual(float(linear.d_rate(0.5)), 0.027009998308318878, 3)
         self.assertAlmostEqual(float(linear.d_rate(0.9)), 0.03428379282808274, 3)
 
+    def test_stream(self) -> None:
+        chunks = list(self.vasicek.simulate_chunks(25, 10))
+        self.assertEqual([chunk.get_nb_sim for chunk in chunks], [10, 10, 5])
+        aggregate = self.vasicek.simulate_stream(25, 10)
+        self.assertEqual(aggregate.get_nb_sim, 25)
+        self.assertTrue(np.allclose(aggregate.yield_curve().get_rate,
+                                    self.vasicek.simulate_paths(4).yield_curve().get_rate, rtol=1e-12))
+        self.assertTrue(np.allclose(aggregate.rate_variance(), 0))
+
+    def test_exact_scheme(self) -> None:
+        a, b, sigma, r0 = 0.5, 0.05, 0.02, 0.01
+        aggregate = Vasicek(a, b, sigma, r0, 10, 1 / 12, seed=3).simulate_stream(20000, 5000, scheme="exact")
+        t = aggregate.get_time
+        factor = -np.expm1(-a * t) / a
+        price = np.exp((factor - t) * (a * a * b - sigma ** 2 / 2) / a ** 2 - sigma ** 2 * factor ** 2 / (4 * a)
+                       - factor * r0)
+        error = np.sqrt(aggregate.discount_variance() / aggregate.get_nb_sim)
+        self.assertLess(np.abs((aggregate.discount_factor() - price) / error).max(), 4)
+        grid = np.arange(aggregate.get_steps) / 12
+        self.assertTrue(np.allclose(aggregate.mean_rate(), b + (r0 - b) * np.exp(-a * grid), atol=5e-4))
+        simulation = self.vasicek.simulate_paths(3, scheme="exact")
+        self.assertEqual(simulation.get_integrated.shape, simulation.get_sim.shape)
+        self.assertRaises(TypeError, lambda: self.vasicek.simulate_paths(3, scheme="milstein"))
+
+    def test_variance_reduction(self) -> None:
+        model = Vasicek(0.5, 0.05, 0.02, 0.01, 10, 1 / 12, seed=5)
+        price = model.zero_coupon_price()
+        reference = model.simulate_stream(10000, 5000, scheme="exact").discount_standard_error()
+        for options in ({"sampling": "antithetic"}, {"sampling": "sobol", "chunk_size": 128},
+                        {"control_variate": True}):
+            aggregate = model.simulate_stream(1024, scheme="exact", **{"chunk_size": 512, **options})
+            error = aggregate.discount_standard_error()
+            self.assertTrue((error[11:] < reference[11:]).all())
+            self.assertLess(np.abs((aggregate.discount_factor() - price) / error).max(), 5)
+        self.assertRaises(ValueError, lambda: model.simulate_paths(10, control_variate=True))
+        self.assertRaises(ValueError, lambda: model.simulate_stream(1001, 1000, sampling="antithetic"))
+        self.assertRaises(ValueError, lambda: model.simulate_stream(1002, 501, sampling="antithetic"))
+        self.assertRaises(ValueError, lambda: model.simulate_parallel(1001, 1000, 1, sampling="antithetic"))
+        euler = model.simulate_paths(256, sampling="sobol")
+        self.assertEqual(euler.get_sampling, "sobol")
+        self.assertTrue(np.allclose(euler.get_sim[0], 0.01))
+
+    def test_seed(self) -> None:
+        first = Vasicek(0.5, 0.05, 0.02, 0.01, 1, 1 / 12, seed=7).simulate_paths(8, sampling="sobol")
+        second = Vasicek(0.5, 0.05, 0.02, 0.01, 1, 1 / 12, seed=7).simulate_paths(8, sampling="sobol")
+        self.assertTrue(np.array_equal(first.get_sim, second.get_sim))
+        model = Vasicek(0.5, 0.05, 0.02, 0.01, 1, 1 / 12, seed=7)
+        self.assertFalse(np.array_equal(model.simulate_paths(5).get_sim, model.simulate_paths(5).get_sim))
+        first = model.simulate_stream(64, 32, seed=9).discount_factor()
+        self.assertTrue(np.array_equal(first, model.simulate_stream(64, 32, seed=9).discount_factor()))
+        self.assertTrue(np.array_equal(first, model.simulate_parallel(64, 32, 2, stream=True, seed=9).discount_factor()))
+        self.assertFalse(np.array_equal(model.simulate_stream(64, 32).discount_factor(),
+                                        model.simulate_stream(64, 32).discount_factor()))
+        sequence = np.random.SeedSequence(9)
+        self.assertTrue(np.array_equal(first, model.simulate_stream(64, 32, seed=sequence).discount_factor()))
+        self.assertEqual(sequence.n_children_spawned, 0)
+        model.set_attr("_seed", 7)
+        self.assertIsInstance(model.get_attr("_seed"), np.random.SeedSequence)
+        fresh = Vasicek(0.5, 0.05, 0.02, 0.01, 1, 1 / 12, seed=7)
+        self.assertTrue(np.array_equal(model.simulate_paths(5).get_sim, fresh.simulate_paths(5).get_sim))
+        self.assertTrue(np.array_equal(model.simulate_stream(64, 32).discount_factor(),
+                                       fresh.simulate_stream(64, 32).discount_factor()))
+
+    def test_parallel(self) -> None:
+        def model() -> Vasicek:
+            return Vasicek(0.5, 0.05, 0.02, 0.01, 2, 1 / 12, seed=11)
+        serial = model().simulate_parallel(600, 128, workers=1, scheme="exact")
+        pooled = model().simulate_parallel(600, 128, workers=2, scheme="exact")
+        chunks = list(model().simulate_chunks(600, 128, "exact"))
+        self.assertTrue(np.array_equal(serial.get_sim, pooled.get_sim))
+        self.assertTrue(np.array_equal(serial.get_integrated, pooled.get_integrated))
+        self.assertTrue(np.array_equal(serial.get_sim, np.concatenate([c.get_sim for c in chunks], axis=1)))
+        streamed = model().simulate_stream(600, 128, "exact", "antithetic", True)
+        for workers in (1, 3):
+            aggregate = model().simulate_parallel(600, 128, workers, "exact", "antithetic", True, stream=True)
+            self.assertTrue(np.array_equal(aggregate.discount_factor(), streamed.discount_factor()))
+            self.assertTrue(np.array_equal(aggregate.discount_standard_error(), streamed.discount_standard_error()))
+        merged = model().simulate_parallel(600, 128, 2, "exact", "antithetic").aggregate()
+        self.assertEqual(merged.get_nb_samples, 300)
+        self.assertTrue(np.allclose(merged.discount_standard_error(),
+                                    model().simulate_stream(600, 128, "exact", "antithetic").discount_standard_error()))
+
 
 if __name__ == '__main__':
     unittest.main()